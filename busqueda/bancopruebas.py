@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Banco de pruebas de los algoritmos de búsqueda sobre problemas sintéticos.
+
+Ejecuta cada algoritmo sobre los problemas de generadores.py, guarda el
+tiempo, los nodos y el pico de memoria en JSON y compara con una ejecución
+anterior para detectar regresiones:
+    python bancopruebas.py --tamanos 1000 10000 --salida base.json
+    python bancopruebas.py --tamanos 1000 10000 --base base.json
+
+Curso del canal de Youtube 'Descubriendo la Inteligencia Artificial'.
+Autor: JL Iglesias Feria (jl.iglesias.feria@gmail.com)
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+from time import perf_counter
+
+import informada
+import noinformada
+from contexto import ContextoBusqueda
+from contexto import busca_acotada
+from generadores import GENERADORES
+from grafos import Problema
+from grafos import ProblemaImplicito
+
+# Motivos de parada propios del banco de pruebas.
+NO_APLICABLE = 'no aplicable'
+RECURSION = 'recursion'
+
+
+# %%
+def _ara_estrella(problema):
+    """ARA* hasta su última solución (la de menor coste)."""
+    solucion = None
+    for solucion, _ in informada.ara_estrella(problema):
+        pass
+    return solucion
+
+
+# Algoritmos del banco: (nombre, búsqueda, argumentos tras el problema).
+ALGORITMOS = [
+    ('anchura', noinformada.anchura, ()),
+    ('anchura_compilada', noinformada.anchura_compilada, ()),
+    ('coste_uniforme', noinformada.coste_uniforme, ()),
+    ('coste_uniforme_compilado', noinformada.coste_uniforme_compilado, ()),
+    ('coste_uniforme_todos', noinformada.coste_uniforme_todos, ()),
+    ('profundidad', noinformada.profundidad, ()),
+    ('profundidad_recursiva', noinformada.profundidad_recursiva, ()),
+    ('profundidad_iterativa', noinformada.profundidad_iterativa, (99999,)),
+    ('profundidad_iterativa_coste', noinformada.profundidad_iterativa_coste,
+     ()),
+    ('alargamiento_iterativo', noinformada.alargamiento_iterativo, ()),
+    ('bidireccional', noinformada.bidireccional, ()),
+    ('bidireccional_coste', noinformada.bidireccional_coste, ()),
+    ('voraz', informada.voraz, ()),
+    ('a_estrella', informada.a_estrella, ()),
+    ('a_estrella_todos', informada.a_estrella_todos, ()),
+    ('a_estrella_compilada', informada.a_estrella_compilada, ()),
+    ('ara_estrella', _ara_estrella, ()),
+    ('bidireccional_a_estrella', informada.bidireccional_a_estrella, ()),
+    ('ida_estrella', informada.ida_estrella, ()),
+    ('recursiva_primero_mejor', informada.recursiva_primero_mejor, ()),
+    ('recursiva_primero_mejor_pila', informada.recursiva_primero_mejor_pila,
+     ()),
+    ('sma_estrella', informada.sma_estrella, (10000,)),
+]
+
+
+# %%
+def ejecutar(generadores=None, tamanos=(1000,), algoritmos=None, semilla=0,
+             limite=2.0, memoria=True, repeticiones=3, informe=None):
+    """Ejecuta los algoritmos sobre los problemas generados.
+
+    Cada búsqueda tiene un plazo de limite segundos (con un contexto de
+    búsqueda) y se mide sobre un problema sin nada calculado de búsquedas
+    anteriores; el tiempo de generar el problema no se cuenta. Las que
+    terminan se repiten y se toma el menor tiempo, que es el menos afectado
+    por el resto del sistema. El pico de memoria se mide con tracemalloc en
+    otra ejecución, para que su sobrecoste no altere el tiempo. Devuelve
+    una lista de diccionarios con generador, estados, semilla, algoritmo,
+    coste (None si no ha terminado), tiempo, expandidos, generados, memoria
+    (bytes) y motivo de parada (None si ha terminado). A informe, si se
+    indica, se le pasa cada resultado según se obtiene.
+    """
+    resultados = []
+    for nombre_generador in generadores or list(GENERADORES):
+        generador = GENERADORES[nombre_generador]
+        for estados in tamanos:
+            base = generador(estados, semilla)
+            for nombre, busqueda, argumentos in ALGORITMOS:
+                if algoritmos and nombre not in algoritmos:
+                    continue
+                problema = _problema_limpio(base, generador, estados,
+                                            semilla)
+                resultado = _mide(busqueda, problema, argumentos, limite)
+                for _ in range(repeticiones - 1):
+                    if resultado['motivo']:
+                        break
+                    problema = _problema_limpio(base, generador, estados,
+                                                semilla)
+                    repeticion = _mide(busqueda, problema, argumentos, limite)
+                    resultado['tiempo'] = min(resultado['tiempo'],
+                                              repeticion['tiempo'])
+                resultado.update(generador=nombre_generador,
+                                 estados=estados, semilla=semilla,
+                                 algoritmo=nombre, memoria=None)
+                if memoria and resultado['motivo'] not in (NO_APLICABLE,
+                                                           RECURSION):
+                    problema = _problema_limpio(base, generador, estados,
+                                                semilla)
+                    tracemalloc.start()
+                    try:
+                        _mide(busqueda, problema, argumentos, limite)
+                        resultado['memoria'] = (
+                            tracemalloc.get_traced_memory()[1])
+                    finally:
+                        tracemalloc.stop()
+                resultados.append(resultado)
+                if informe:
+                    informe(resultado)
+    return resultados
+
+
+def _problema_limpio(base, generador, estados, semilla):
+    """Problema igual al base sin cachés de búsquedas anteriores.
+
+    Los problemas explícitos comparten los diccionarios del base, que las
+    búsquedas no modifican, y los implícitos se vuelven a generar, lo que
+    es inmediato.
+    """
+    if isinstance(base, ProblemaImplicito):
+        return generador(estados, semilla)
+    return Problema(base.estado_inicial, list(base.estados_objetivos),
+                    base.acciones, base.costes, base.heuristicas,
+                    base.infinito)
+
+
+def _mide(busqueda, problema, argumentos, limite):
+    """Resuelve el problema dentro del plazo y mide tiempo y nodos."""
+    contexto = ContextoBusqueda(tiempo=limite)
+    inicio = perf_counter()
+    try:
+        resultado, motivo = busca_acotada(busqueda, problema, contexto,
+                                          *argumentos)
+    except NotImplementedError:
+        resultado, motivo = None, NO_APLICABLE
+    except RecursionError:
+        resultado, motivo = None, RECURSION
+    return {'coste': None if motivo else _coste(resultado),
+            'tiempo': perf_counter() - inicio,
+            'expandidos': contexto.expandidos,
+            'generados': contexto.generados,
+            'motivo': motivo}
+
+
+def _coste(resultado):
+    """Coste de la solución devuelta por cualquiera de las búsquedas.
+
+    Las búsquedas hasta todos los objetivos devuelven un diccionario (se
+    toma el menor coste), la bidireccional los dos nodos de encuentro y las
+    recursivas el nodo con su límite.
+    """
+    if isinstance(resultado, dict):
+        return min((nodo.coste for nodo in resultado.values()), default=None)
+    if isinstance(resultado, tuple):
+        nodos = [parte for parte in resultado if hasattr(parte, 'coste')]
+        return sum(nodo.coste for nodo in nodos) if nodos else None
+    return resultado.coste if resultado else None
+
+
+# %%
+def guardar(resultados, ruta):
+    """Guarda los resultados del banco de pruebas en un fichero JSON."""
+    with open(ruta, 'w', encoding='utf-8') as fichero:
+        json.dump(resultados, fichero, indent=1)
+
+
+def cargar(ruta):
+    """Carga los resultados de un fichero JSON del banco de pruebas."""
+    with open(ruta, encoding='utf-8') as fichero:
+        return json.load(fichero)
+
+
+def comparar(resultados, base, tolerancia=0.25, minimo=0.01):
+    """Compara los resultados con los de una ejecución base.
+
+    Devuelve una lista de mensajes con las regresiones de las ejecuciones
+    que están en las dos: un coste distinto, una búsqueda que ya no termina
+    en el plazo, más nodos expandidos, o un tiempo o una memoria que
+    superan los de la base en más de la tolerancia (el tiempo, además, en
+    más de minimo segundos, para no avisar por el ruido de las búsquedas
+    muy cortas). Los nodos, el tiempo y la memoria sólo se comparan si
+    ambas búsquedas han terminado.
+    """
+    anteriores = {_clave(resultado): resultado for resultado in base}
+    regresiones = []
+    for resultado in resultados:
+        anterior = anteriores.get(_clave(resultado))
+        if anterior is None:
+            continue
+        nombre = "{0} en {1} {2}".format(resultado['algoritmo'],
+                                         resultado['generador'],
+                                         resultado['estados'])
+        if resultado['motivo'] and not anterior['motivo']:
+            regresiones.append("{0}: no termina ({1})".format(
+                nombre, resultado['motivo']))
+            continue
+        if resultado['motivo'] or anterior['motivo']:
+            continue
+        if resultado['coste'] != anterior['coste']:
+            regresiones.append("{0}: coste {1} en vez de {2}".format(
+                nombre, resultado['coste'], anterior['coste']))
+        if resultado['expandidos'] > anterior['expandidos']:
+            regresiones.append("{0}: {1} expandidos en vez de {2}".format(
+                nombre, resultado['expandidos'], anterior['expandidos']))
+        if(resultado['tiempo'] > anterior['tiempo'] * (1 + tolerancia) and
+           resultado['tiempo'] - anterior['tiempo'] > minimo):
+            regresiones.append("{0}: {1:.3f} s en vez de {2:.3f} s".format(
+                nombre, resultado['tiempo'], anterior['tiempo']))
+        if(resultado['memoria'] is not None and
+           anterior['memoria'] is not None and
+           resultado['memoria'] > anterior['memoria'] * (1 + tolerancia)):
+            regresiones.append("{0}: {1} bytes en vez de {2}".format(
+                nombre, resultado['memoria'], anterior['memoria']))
+    return regresiones
+
+
+def _clave(resultado):
+    """Identifica una ejecución para compararla con la de otro fichero."""
+    return (resultado['generador'], resultado['estados'],
+            resultado.get('semilla', 0), resultado['algoritmo'])
+
+
+def muestra_resultado(resultado):
+    """Muestra una línea con el resultado de una ejecución."""
+    msg = ("{generador} {estados} {algoritmo}: coste {coste}, "
+           "{tiempo:.3f} s, {expandidos} expandidos, {generados} generados, "
+           "{memoria} bytes, motivo {motivo}")
+    print(msg.format(**resultado))
+
+
+# %%
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Banco de pruebas de los algoritmos de búsqueda.")
+    parser.add_argument('--generadores', nargs='+', choices=GENERADORES,
+                        help="generadores de problemas (todos por defecto)")
+    parser.add_argument('--tamanos', nargs='+', type=int, default=[1000],
+                        help="número de estados de los problemas")
+    parser.add_argument('--algoritmos', nargs='+',
+                        choices=[nombre for nombre, _, _ in ALGORITMOS],
+                        help="algoritmos a ejecutar (todos por defecto)")
+    parser.add_argument('--limite', type=float, default=2.0,
+                        help="segundos como máximo por búsqueda")
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--repeticiones', type=int, default=3,
+                        help="veces que se mide el tiempo de cada búsqueda")
+    parser.add_argument('--sin-memoria', action='store_true',
+                        help="no medir el pico de memoria")
+    parser.add_argument('--salida', help="fichero JSON de resultados")
+    parser.add_argument('--base', help="fichero JSON con el que comparar")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="aumento relativo de tiempo o memoria admitido")
+    opciones = parser.parse_args()
+
+    resultados_banco = ejecutar(opciones.generadores, opciones.tamanos,
+                                opciones.algoritmos, opciones.semilla,
+                                opciones.limite, not opciones.sin_memoria,
+                                opciones.repeticiones, muestra_resultado)
+    if opciones.salida:
+        guardar(resultados_banco, opciones.salida)
+    if opciones.base:
+        regresiones_banco = comparar(resultados_banco,
+                                     cargar(opciones.base),
+                                     opciones.tolerancia)
+        for regresion in regresiones_banco:
+            print("REGRESIÓN " + regresion)
+        if regresiones_banco:
+            sys.exit(1)
+        print("Sin regresiones respecto a {0}".format(opciones.base))
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Límites de tiempo, de nodos y cancelación compartidos por las búsquedas.
+
+Curso del canal de Youtube 'Descubriendo la Inteligencia Artificial'.
+Autor: JL Iglesias Feria (jl.iglesias.feria@gmail.com)
+"""
+from time import perf_counter
+
+# Motivos por los que se detiene una búsqueda.
+TIEMPO = 'tiempo'
+EXPANDIDOS = 'expandidos'
+GENERADOS = 'generados'
+CANCELADA = 'cancelada'
+
+
+# %%
+class ContextoBusqueda:
+    """Presupuesto de una búsqueda: plazo, máximo de nodos y cancelación.
+
+    Se asigna al problema (problema.contexto = ContextoBusqueda(...)) y
+    todos los algoritmos lo consultan antes de expandir cada nodo; los
+    nodos generados se cuentan al crear cada hijo y las evaluaciones de la
+    heurística al calcularla el problema. El tiempo se indica en
+    segundos y empieza a contar al crear o reiniciar el contexto. La
+    cancelación puede pedirse con cancelar() o con cualquier objeto con
+    is_set(), como threading.Event o multiprocessing.Event.
+    Cuando se agota el presupuesto la búsqueda termina sin solución y el
+    contexto guarda el motivo y el resultado parcial: el nodo que se iba a
+    expandir (el más prometedor en las búsquedas primero el mejor).
+    """
+
+    def __init__(self, tiempo=None, expandidos=None, generados=None,
+                 cancelacion=None):
+        self.tiempo = tiempo
+        self.maximo_expandidos = expandidos
+        self.maximo_generados = generados
+        self.cancelacion = cancelacion
+        self.reiniciar()
+
+    def __str__(self):
+        """Representación en modo texto del contexto."""
+        msg = "Expandidos {0}, generados {1}, motivo {2}"
+        return msg.format(self.expandidos, self.generados, self.motivo)
+
+    def __repr__(self):
+        """Representación del contexto para depuración."""
+        return "ContextoBusqueda({0})".format(self)
+
+    def reiniciar(self):
+        """Vuelve a poner en marcha el reloj y los contadores."""
+        self.final = None
+        if self.tiempo is not None:
+            self.final = perf_counter() + self.tiempo
+        self.expandidos = 0
+        self.generados = 0
+        self.evaluaciones = 0
+        self.cancelada = False
+        self.motivo = None
+        self.parcial = None
+
+    def cancelar(self):
+        """Pide a la búsqueda que se detenga en la siguiente expansión."""
+        self.cancelada = True
+
+    def agotado(self, nodo=None, frontera=0, explorados=0, generados=0):
+        """Dice si la búsqueda debe parar y, si no, cuenta la expansión.
+
+        Recibe el nodo que se va a expandir (el índice del estado en las
+        búsquedas compiladas) y los tamaños de la frontera y de los
+        explorados. Los algoritmos que no crean nodos hijos indican cuántos
+        genera la expansión. Una vez agotado sigue devolviendo True.
+        """
+        if self.motivo:
+            return True
+        if(self.cancelada or (self.cancelacion is not None and
+                              self.cancelacion.is_set())):
+            self.motivo = CANCELADA
+        elif self.final is not None and perf_counter() > self.final:
+            self.motivo = TIEMPO
+        elif(self.maximo_expandidos is not None and
+             self.expandidos >= self.maximo_expandidos):
+            self.motivo = EXPANDIDOS
+        elif(self.maximo_generados is not None and
+             self.generados > self.maximo_generados):
+            self.motivo = GENERADOS
+        else:
+            self.expandidos += 1
+            self.generados += generados
+            return False
+        self.parcial = nodo
+        return True
+
+    def generar(self, estado):
+        """Cuenta un nodo generado con el estado indicado."""
+        self.generados += 1
+
+    def evaluar(self):
+        """Cuenta una evaluación de la heurística."""
+        self.evaluaciones += 1
+
+    def fase(self, nombre):
+        """Marca el comienzo de una fase de la búsqueda.
+
+        El contexto básico no mide el tiempo de las fases.
+        """
+
+
+def busca_acotada(busqueda, problema, contexto, *argumentos):
+    """Resuelve el problema con la búsqueda dentro del presupuesto indicado.
+
+    Asigna el contexto al problema mientras dura la búsqueda. Devuelve el
+    resultado y el motivo de parada (None si la búsqueda ha terminado).
+    Si se ha detenido sin encontrar ningún nodo solución devuelve el
+    resultado parcial del contexto.
+    """
+    anterior = problema.contexto
+    problema.contexto = contexto
+    contexto.reiniciar()
+    contexto.fase('busqueda')
+    try:
+        resultado = busqueda(problema, *argumentos)
+    finally:
+        contexto.fase(None)
+        problema.contexto = anterior
+    if contexto.motivo and not _hay_solucion(resultado):
+        return contexto.parcial, contexto.motivo
+    return resultado, contexto.motivo
+
+
+def _hay_solucion(resultado):
+    """Indica si el resultado de una búsqueda contiene algún nodo.
+
+    Algunas búsquedas devuelven tuplas, como (nodo, límite) o los dos nodos
+    de una búsqueda bidireccional, que no están vacías aunque no haya nodo.
+    """
+    if isinstance(resultado, tuple):
+        return any(parte is not None and not isinstance(parte, (int, float))
+                   for parte in resultado)
+    return bool(resultado)
+
+
+# %%
+if __name__ == '__main__':
+    from informada import a_estrella
+    from noinformada import profundidad_iterativa_coste
+    from rendimiento import rejilla
+
+    LADO = 60
+    problema_rejilla = rejilla(LADO)
+
+    print("***** A* SIN LÍMITES EN REJILLA {0}x{0} *****".format(LADO))
+    contexto = ContextoBusqueda()
+    solucion, motivo = busca_acotada(a_estrella, problema_rejilla, contexto)
+    print("Coste {0}, motivo {1}, {2}".format(solucion.coste, motivo,
+                                               contexto))
+    print("***** A* CON 500 EXPANSIONES *****")
+    contexto = ContextoBusqueda(expandidos=500)
+    parcial, motivo = busca_acotada(a_estrella, problema_rejilla, contexto)
+    print("Parcial {0} (coste {1}), motivo {2}".format(parcial,
+                                                       parcial.coste, motivo))
+    print("***** PROFUNDIDAD ITERATIVA CON COSTES EN 50 ms *****")
+    contexto = ContextoBusqueda(tiempo=0.05)
+    parcial, motivo = busca_acotada(profundidad_iterativa_coste,
+                                    problema_rejilla, contexto)
+    print("Parcial {0}, motivo {1}, {2}".format(parcial, motivo, contexto))
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estadísticas de las búsquedas: nodos, picos de memoria, tiempos y avisos.
+
+Curso del canal de Youtube 'Descubriendo la Inteligencia Artificial'.
+Autor: JL Iglesias Feria (jl.iglesias.feria@gmail.com)
+"""
+from time import perf_counter
+
+from contexto import ContextoBusqueda
+from contexto import busca_acotada
+
+
+# %%
+class EstadisticasBusqueda(ContextoBusqueda):
+    """Contexto de búsqueda que además lleva las estadísticas de la búsqueda.
+
+    Como cualquier contexto se asigna al problema (o se pasa a
+    busca_acotada) y admite los mismos límites. Además de los nodos
+    expandidos, generados y las evaluaciones de la heurística cuenta:
+    - duplicados: nodos generados con un estado ya alcanzado.
+    - reaperturas: expansiones de un estado ya expandido antes.
+    - pico_frontera y pico_explorados: mayores tamaños de la frontera y de
+      los explorados al expandir.
+    - tiempos: segundos de cada fase de la búsqueda (compilación, cada peso
+      de ARA*...).
+    Las búsquedas compiladas no crean nodos, por lo que no cuentan los
+    duplicados, y sus explorados son arrays de tamaño fijo.
+    Las funciones de al_expandir se llaman como funcion(nodo, estadisticas)
+    en cada expansión. Sin contexto en el problema los algoritmos no hacen
+    nada de esto.
+    """
+
+    def __init__(self, tiempo=None, expandidos=None, generados=None,
+                 cancelacion=None, al_expandir=None):
+        self.al_expandir = list(al_expandir or [])
+        super().__init__(tiempo, expandidos, generados, cancelacion)
+
+    def __str__(self):
+        """Representación en modo texto de las estadísticas."""
+        msg = ("Expandidos {0}, generados {1}, duplicados {2}, "
+               "reaperturas {3}, evaluaciones {4}, pico frontera {5}, "
+               "pico explorados {6}, tiempos {7}")
+        tiempos = {fase: round(segundos, 4)
+                   for fase, segundos in self.tiempos.items()}
+        return msg.format(self.expandidos, self.generados, self.duplicados,
+                          self.reaperturas, self.evaluaciones,
+                          self.pico_frontera, self.pico_explorados, tiempos)
+
+    def __repr__(self):
+        """Representación de las estadísticas para depuración."""
+        return "EstadisticasBusqueda({0})".format(self)
+
+    def reiniciar(self):
+        """Vuelve a poner a cero el reloj, los contadores y los picos."""
+        super().reiniciar()
+        self.duplicados = 0
+        self.reaperturas = 0
+        self.pico_frontera = 0
+        self.pico_explorados = 0
+        self.tiempos = {}
+        self.fase_actual = None
+        self.inicio_fase = None
+        self.estados_generados = set()
+        self.estados_expandidos = set()
+
+    def agotado(self, nodo=None, frontera=0, explorados=0, generados=0):
+        """Dice si la búsqueda debe parar y, si no, anota la expansión."""
+        if super().agotado(nodo, frontera, explorados, generados):
+            return True
+        estado = getattr(nodo, 'estado', nodo)
+        if estado is not None:
+            if estado in self.estados_expandidos:
+                self.reaperturas += 1
+            else:
+                self.estados_expandidos.add(estado)
+            self.estados_generados.add(estado)
+        if frontera > self.pico_frontera:
+            self.pico_frontera = frontera
+        if explorados > self.pico_explorados:
+            self.pico_explorados = explorados
+        for funcion in self.al_expandir:
+            funcion(nodo, self)
+        return False
+
+    def generar(self, estado):
+        """Cuenta un nodo generado y si su estado ya se había alcanzado."""
+        super().generar(estado)
+        if estado in self.estados_generados:
+            self.duplicados += 1
+        else:
+            self.estados_generados.add(estado)
+
+    def fase(self, nombre):
+        """Termina la fase actual y empieza la indicada (None para parar).
+
+        Los tiempos de las fases con el mismo nombre se suman.
+        """
+        ahora = perf_counter()
+        if self.fase_actual is not None:
+            self.tiempos[self.fase_actual] = (
+                self.tiempos.get(self.fase_actual, 0) +
+                ahora - self.inicio_fase)
+        self.fase_actual = nombre
+        self.inicio_fase = ahora
+
+
+def mide_busqueda(busqueda, problema, *argumentos):
+    """Resuelve el problema con la búsqueda y devuelve sus estadísticas."""
+    estadisticas = EstadisticasBusqueda()
+    resultado, _ = busca_acotada(busqueda, problema, estadisticas,
+                                 *argumentos)
+    return resultado, estadisticas
+
+
+# %%
+if __name__ == '__main__':
+    from informada import a_estrella
+    from informada import a_estrella_compilada
+    from informada import ida_estrella
+    from noinformada import coste_uniforme
+    from rendimiento import rejilla
+
+    LADO = 30
+
+    def manhattan(estado, objetivo):
+        fila, columna = map(int, estado.nombre.split(','))
+        fila_fin, columna_fin = map(int, objetivo.nombre.split(','))
+        return abs(fila - fila_fin) + abs(columna - columna_fin)
+
+    for busqueda in (coste_uniforme, a_estrella, a_estrella_compilada,
+                     ida_estrella):
+        problema_rejilla = rejilla(LADO)
+        problema_rejilla.heuristicas = manhattan
+        print("***** {0} EN REJILLA {1}x{1} *****".format(
+            busqueda.__name__.upper(), LADO))
+        solucion, estadisticas = mide_busqueda(busqueda, problema_rejilla)
+        print("Coste {0}".format(solucion.coste))
+        print(estadisticas)
+
+    print("***** A* AVISANDO CADA 200 EXPANSIONES *****")
+
+    def avisa(nodo, estadisticas):
+        if estadisticas.expandidos % 200 == 0:
+            print("  {0} expandidos, coste {1}".format(
+                estadisticas.expandidos, nodo.coste))
+
+    estadisticas = EstadisticasBusqueda(al_expandir=[avisa])
+    busca_acotada(a_estrella, problema_rejilla, estadisticas)
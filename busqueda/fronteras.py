@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estructuras de datos para las fronteras de las búsquedas en grafos.
+
+Curso del canal de Youtube 'Descubriendo la Inteligencia Artificial'.
+Autor: JL Iglesias Feria (jl.iglesias.feria@gmail.com)
+"""
+from collections import deque
+
+
+def _coste(nodo):
+    """Prioridad por defecto de las fronteras: el coste del nodo."""
+    return nodo.coste
+
+
+# %%
+class FronteraCola:
+    """Frontera FIFO (cola) indexada por estado.
+
+    Añadir, sacar y saber si un estado está en la frontera cuestan O(1).
+    Cada estado debe estar como mucho una vez en la frontera.
+    """
+
+    def __init__(self):
+        self.nodos = deque()
+        self.estados = set()
+
+    def __len__(self):
+        """Número de nodos en la frontera."""
+        return len(self.nodos)
+
+    def __bool__(self):
+        """Indica si quedan nodos en la frontera."""
+        return bool(self.nodos)
+
+    def __contains__(self, estado):
+        """Indica si el estado indicado está en la frontera."""
+        return estado in self.estados
+
+    def __iter__(self):
+        """Recorre los nodos de la frontera en orden de llegada."""
+        return iter(self.nodos)
+
+    def __str__(self):
+        """Representación en modo texto de la frontera."""
+        return str([nodo.estado.nombre for nodo in self.nodos])
+
+    def __repr__(self):
+        """Representación de la frontera para depuración."""
+        return "{0}({1})".format(type(self).__name__, self)
+
+    def agregar(self, nodo):
+        """Añade un nodo a la frontera."""
+        self.nodos.append(nodo)
+        self.estados.add(nodo.estado)
+
+    def sacar(self):
+        """Saca y devuelve el nodo más antiguo de la frontera."""
+        if not self.nodos:
+            return None
+        nodo = self.nodos.popleft()
+        self.estados.discard(nodo.estado)
+        return nodo
+
+
+class FronteraPila(FronteraCola):
+    """Frontera LIFO (pila) indexada por estado."""
+
+    def sacar(self):
+        """Saca y devuelve el nodo más reciente de la frontera."""
+        if not self.nodos:
+            return None
+        nodo = self.nodos.pop()
+        self.estados.discard(nodo.estado)
+        return nodo
+
+
+# %%
+class FronteraPrioridad:
+    """Frontera ordenada por prioridad (montículo binario) indexada por estado.
+
+    Permite añadir, sacar el mejor nodo y mejorar la prioridad de un estado
+    que ya está en la frontera (decrease-key) en tiempo O(log n), y saber si
+    un estado está en la frontera en tiempo O(1).
+    """
+
+    def __init__(self, prioridad=None):
+        self.prioridad = prioridad or _coste
+        self.monticulo = []
+        self.posiciones = {}
+        self.contador = 0
+
+    def __len__(self):
+        """Número de nodos en la frontera."""
+        return len(self.monticulo)
+
+    def __bool__(self):
+        """Indica si quedan nodos en la frontera."""
+        return bool(self.monticulo)
+
+    def __contains__(self, estado):
+        """Indica si el estado indicado está en la frontera."""
+        return estado in self.posiciones
+
+    def __iter__(self):
+        """Recorre los nodos de la frontera (sin ningún orden concreto)."""
+        return (entrada[2] for entrada in self.monticulo)
+
+    def __str__(self):
+        """Representación en modo texto de la frontera."""
+        return str([entrada[2].estado.nombre for entrada in self.monticulo])
+
+    def __repr__(self):
+        """Representación de la frontera para depuración."""
+        return "FronteraPrioridad({0})".format(self)
+
+    def minimo(self):
+        """Devuelve la menor prioridad de la frontera sin sacar el nodo."""
+        if not self.monticulo:
+            return None
+        return self.monticulo[0][0]
+
+    def agregar(self, nodo):
+        """Añade un nodo a la frontera."""
+        entrada = [self.prioridad(nodo), self.contador, nodo]
+        self.contador += 1
+        self.monticulo.append(entrada)
+        indice = len(self.monticulo) - 1
+        self.posiciones[nodo.estado] = indice
+        self.__subir(indice)
+
+    def sacar(self):
+        """Saca y devuelve el nodo de menor prioridad de la frontera."""
+        if not self.monticulo:
+            return None
+        return self.__quitar(0)
+
+    def actualizar(self, nodo):
+        """Sustituye el nodo del mismo estado si el nuevo es más prioritario.
+
+        El nodo sustituido conserva su orden de llegada para deshacer empates.
+        Devuelve si se ha realizado la sustitución.
+        """
+        indice = self.posiciones[nodo.estado]
+        entrada = self.monticulo[indice]
+        prioridad = self.prioridad(nodo)
+        if prioridad >= entrada[0]:
+            return False
+        entrada[0] = prioridad
+        entrada[2] = nodo
+        self.__subir(indice)
+        return True
+
+    def mejorar(self, nodo):
+        """Añade el nodo o, si su estado ya está, lo sustituye si es mejor.
+
+        Devuelve si el nodo ha entrado en la frontera.
+        """
+        if nodo.estado in self.posiciones:
+            return self.actualizar(nodo)
+        self.agregar(nodo)
+        return True
+
+    def __quitar(self, indice):
+        """Quita la entrada de la posición indicada y devuelve su nodo."""
+        ultima = self.monticulo.pop()
+        if indice == len(self.monticulo):
+            del self.posiciones[ultima[2].estado]
+            return ultima[2]
+        entrada = self.monticulo[indice]
+        del self.posiciones[entrada[2].estado]
+        self.monticulo[indice] = ultima
+        self.posiciones[ultima[2].estado] = indice
+        self.__bajar(indice)
+        self.__subir(indice)
+        return entrada[2]
+
+    def __subir(self, indice):
+        """Hace subir la entrada indicada hasta su posición en el montículo."""
+        monticulo = self.monticulo
+        entrada = monticulo[indice]
+        clave = entrada[:2]
+        while indice > 0:
+            indice_padre = (indice - 1) >> 1
+            padre = monticulo[indice_padre]
+            if clave >= padre[:2]:
+                break
+            monticulo[indice] = padre
+            self.posiciones[padre[2].estado] = indice
+            indice = indice_padre
+        monticulo[indice] = entrada
+        self.posiciones[entrada[2].estado] = indice
+
+    def __bajar(self, indice):
+        """Hace bajar la entrada indicada hasta su posición en el montículo."""
+        monticulo = self.monticulo
+        total = len(monticulo)
+        entrada = monticulo[indice]
+        clave = entrada[:2]
+        while True:
+            indice_hijo = 2 * indice + 1
+            if indice_hijo >= total:
+                break
+            derecho = indice_hijo + 1
+            if(derecho < total and
+               monticulo[derecho][:2] < monticulo[indice_hijo][:2]):
+                indice_hijo = derecho
+            hijo = monticulo[indice_hijo]
+            if clave <= hijo[:2]:
+                break
+            monticulo[indice] = hijo
+            self.posiciones[hijo[2].estado] = indice
+            indice = indice_hijo
+        monticulo[indice] = entrada
+        self.posiciones[entrada[2].estado] = indice
+
+
+# %%
+class FronteraMinMax:
+    """Frontera con acceso al mejor y al peor nodo (montículo min-max).
+
+    En los niveles pares del montículo cada entrada es menor que todas las
+    de su subárbol y en los impares mayor, así que el mejor nodo está en la
+    raíz y el peor en uno de sus dos hijos. Añadir, sacar el mejor o el
+    peor, quitar un nodo cualquiera y recolocarlo si cambia su prioridad
+    cuestan O(log n). Está indexada por nodo, por lo que puede tener varios
+    nodos con el mismo estado.
+    """
+
+    def __init__(self, prioridad=None):
+        self.prioridad = prioridad or _coste
+        self.monticulo = []
+        self.posiciones = {}
+        self.contador = 0
+
+    def __len__(self):
+        """Número de nodos en la frontera."""
+        return len(self.monticulo)
+
+    def __bool__(self):
+        """Indica si quedan nodos en la frontera."""
+        return bool(self.monticulo)
+
+    def __contains__(self, nodo):
+        """Indica si el nodo indicado está en la frontera."""
+        return nodo in self.posiciones
+
+    def __iter__(self):
+        """Recorre los nodos de la frontera (sin ningún orden concreto)."""
+        return (entrada[2] for entrada in self.monticulo)
+
+    def __str__(self):
+        """Representación en modo texto de la frontera."""
+        return str([entrada[2].estado.nombre for entrada in self.monticulo])
+
+    def __repr__(self):
+        """Representación de la frontera para depuración."""
+        return "FronteraMinMax({0})".format(self)
+
+    def mejor(self):
+        """Devuelve el nodo de menor prioridad sin sacarlo."""
+        if not self.monticulo:
+            return None
+        return self.monticulo[0][2]
+
+    def peor(self):
+        """Devuelve el nodo de mayor prioridad sin sacarlo."""
+        if not self.monticulo:
+            return None
+        return self.monticulo[self.__indice_peor()][2]
+
+    def agregar(self, nodo):
+        """Añade un nodo a la frontera."""
+        entrada = [self.prioridad(nodo), self.contador, nodo]
+        self.contador += 1
+        self.monticulo.append(entrada)
+        indice = len(self.monticulo) - 1
+        self.posiciones[nodo] = indice
+        self.__recolocar(indice)
+
+    def sacar(self):
+        """Saca y devuelve el nodo de menor prioridad de la frontera."""
+        if not self.monticulo:
+            return None
+        return self.__quitar(0)
+
+    def sacar_peor(self):
+        """Saca y devuelve el nodo de mayor prioridad de la frontera."""
+        if not self.monticulo:
+            return None
+        return self.__quitar(self.__indice_peor())
+
+    def quitar(self, nodo):
+        """Quita de la frontera el nodo indicado."""
+        self.__quitar(self.posiciones[nodo])
+
+    def actualizar(self, nodo):
+        """Recoloca el nodo indicado tras cambiar su prioridad."""
+        indice = self.posiciones[nodo]
+        self.monticulo[indice][0] = self.prioridad(nodo)
+        self.__recolocar(indice)
+
+    def __indice_peor(self):
+        """Posición de la entrada de mayor prioridad."""
+        if len(self.monticulo) <= 2:
+            return len(self.monticulo) - 1
+        if self.monticulo[1][:2] >= self.monticulo[2][:2]:
+            return 1
+        return 2
+
+    def __quitar(self, indice):
+        """Quita la entrada de la posición indicada y devuelve su nodo."""
+        ultima = self.monticulo.pop()
+        if indice == len(self.monticulo):
+            del self.posiciones[ultima[2]]
+            return ultima[2]
+        entrada = self.monticulo[indice]
+        del self.posiciones[entrada[2]]
+        self.monticulo[indice] = ultima
+        self.posiciones[ultima[2]] = indice
+        self.__recolocar(indice)
+        return entrada[2]
+
+    def __intercambiar(self, primero, segundo):
+        """Intercambia dos entradas del montículo."""
+        monticulo = self.monticulo
+        monticulo[primero], monticulo[segundo] = (monticulo[segundo],
+                                                  monticulo[primero])
+        self.posiciones[monticulo[primero][2]] = primero
+        self.posiciones[monticulo[segundo][2]] = segundo
+
+    def __recolocar(self, indice):
+        """Sube o baja la entrada indicada hasta su posición en el montículo.
+
+        Si está desordenada respecto a su padre se intercambian: la entrada
+        sigue subiendo por los niveles del padre y la del padre baja.
+        """
+        monticulo = self.monticulo
+        nivel_min = (indice + 1).bit_length() % 2 == 1
+        if indice > 0:
+            padre = (indice - 1) >> 1
+            if nivel_min:
+                desordenada = monticulo[indice][:2] > monticulo[padre][:2]
+            else:
+                desordenada = monticulo[indice][:2] < monticulo[padre][:2]
+            if desordenada:
+                self.__intercambiar(indice, padre)
+                self.__bajar(indice)
+                self.__subir_nivel(padre, mayor=nivel_min)
+                return
+        entrada = monticulo[indice]
+        self.__subir_nivel(indice, mayor=not nivel_min)
+        if monticulo[indice] is entrada:
+            self.__bajar(indice)
+
+    def __subir_nivel(self, indice, mayor):
+        """Sube la entrada de abuelo en abuelo por los niveles min o max."""
+        monticulo = self.monticulo
+        while indice > 2:
+            abuelo = (((indice - 1) >> 1) - 1) >> 1
+            if mayor:
+                if monticulo[indice][:2] <= monticulo[abuelo][:2]:
+                    break
+            elif monticulo[indice][:2] >= monticulo[abuelo][:2]:
+                break
+            self.__intercambiar(indice, abuelo)
+            indice = abuelo
+
+    def __bajar(self, indice):
+        """Hace bajar la entrada indicada hasta su posición en el montículo."""
+        monticulo = self.monticulo
+        total = len(monticulo)
+        mayor = (indice + 1).bit_length() % 2 == 0
+        while True:
+            hijo = 2 * indice + 1
+            if hijo >= total:
+                return
+            descendientes = [hijo, hijo + 1, 2 * hijo + 1, 2 * hijo + 2,
+                             2 * hijo + 3, 2 * hijo + 4]
+            descendientes = [posicion for posicion in descendientes
+                             if posicion < total]
+            if mayor:
+                extremo = max(descendientes,
+                              key=lambda posicion: monticulo[posicion][:2])
+                mejora = monticulo[extremo][:2] > monticulo[indice][:2]
+            else:
+                extremo = min(descendientes,
+                              key=lambda posicion: monticulo[posicion][:2])
+                mejora = monticulo[extremo][:2] < monticulo[indice][:2]
+            if not mejora:
+                return
+            self.__intercambiar(indice, extremo)
+            if extremo <= hijo + 1:
+                return
+            padre = (extremo - 1) >> 1
+            if mayor:
+                desordenado = monticulo[extremo][:2] < monticulo[padre][:2]
+            else:
+                desordenado = monticulo[extremo][:2] > monticulo[padre][:2]
+            if desordenado:
+                self.__intercambiar(extremo, padre)
+            indice = extremo
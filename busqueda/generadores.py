@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generadores de problemas sintéticos de búsqueda de cualquier tamaño.
+
+Curso del canal de Youtube 'Descubriendo la Inteligencia Artificial'.
+Autor: JL Iglesias Feria (jl.iglesias.feria@gmail.com)
+"""
+from collections import deque
+from math import ceil
+from math import dist
+from math import factorial
+from math import isqrt
+from math import pi
+from math import sqrt
+from random import Random
+
+from grafos import Estado
+from grafos import HeuristicaCoordenadas
+from grafos import Problema
+from grafos import ProblemaImplicito
+
+MOVIMIENTOS = {'N': (-1, 0), 'S': (1, 0), 'E': (0, 1), 'O': (0, -1)}
+OPUESTOS = {'N': 'S', 'S': 'N', 'E': 'O', 'O': 'E'}
+ESCALA = 1000
+TABLEROS = ((2, 3), (2, 4), (3, 3), (3, 4), (4, 4))
+
+
+# %%
+def rejilla_pesos(estados, semilla=0):
+    """Rejilla cuadrada con al menos el número de estados indicado.
+
+    Se va de una esquina a la opuesta moviéndose en las cuatro direcciones;
+    entrar en cada casilla cuesta de 1 a 5 según la semilla. Es un problema
+    implícito (las casillas se generan al visitarlas), por lo que sirve
+    para millones de estados, y la heurística es la distancia Manhattan.
+    """
+    lado = max(2, isqrt(estados - 1) + 1)
+    objetivo = Estado("{0},{0}".format(lado - 1), [])
+
+    def casilla(estado):
+        fila, columna = estado.nombre.split(',')
+        return int(fila), int(columna)
+
+    def vecinos(estado):
+        fila, columna = casilla(estado)
+        for nombre, (d_fila, d_columna) in MOVIMIENTOS.items():
+            vecino = (fila + d_fila, columna + d_columna)
+            if 0 <= vecino[0] < lado and 0 <= vecino[1] < lado:
+                yield nombre, vecino
+
+    def sucesores(estado):
+        return {nombre: Estado("{0},{1}".format(*vecino), [])
+                for nombre, vecino in vecinos(estado)}
+
+    def predecesores(estado):
+        return [(OPUESTOS[nombre], Estado("{0},{1}".format(*vecino), []))
+                for nombre, vecino in vecinos(estado)]
+
+    def coste(estado, nombre_accion):
+        fila, columna = casilla(estado)
+        d_fila, d_columna = MOVIMIENTOS[nombre_accion]
+        return 1 + hash((fila + d_fila, columna + d_columna, semilla)) % 5
+
+    def heuristica(estado):
+        fila, columna = casilla(estado)
+        return 2 * (lado - 1) - fila - columna
+
+    return ProblemaImplicito(Estado("0,0", []), sucesores, [objetivo],
+                             coste=coste, heuristica=heuristica,
+                             predecesores=predecesores)
+
+
+def geometrico(estados, semilla=0, grado=8):
+    """Grafo geométrico aleatorio con heurística euclídea.
+
+    Los estados son puntos al azar en un cuadrado de lado ESCALA unidos si
+    están más cerca que el radio que da el grado medio indicado, y cada
+    arista cuesta su longitud redondeada hacia arriba, así que la distancia
+    euclídea es admisible. Se va del punto más cercano a una esquina al
+    más cercano a la opuesta de entre los alcanzables.
+    """
+    aleatorio = Random(semilla)
+    puntos = [(aleatorio.random() * ESCALA, aleatorio.random() * ESCALA)
+              for _ in range(estados)]
+    radio = ESCALA * sqrt(grado / (pi * estados))
+    celdas = {}
+    for indice, (x, y) in enumerate(puntos):
+        celdas.setdefault((int(x // radio), int(y // radio)), []).append(
+            indice)
+    vecinos = [[] for _ in range(estados)]
+    for (celda_x, celda_y), indices in celdas.items():
+        for d_x in (-1, 0, 1):
+            for d_y in (-1, 0, 1):
+                otros = celdas.get((celda_x + d_x, celda_y + d_y), ())
+                for origen in indices:
+                    for destino in otros:
+                        distancia = dist(puntos[origen], puntos[destino])
+                        if origen != destino and distancia < radio:
+                            vecinos[origen].append(
+                                (destino, max(1, ceil(distancia))))
+    lista = [Estado(str(indice), []) for indice in range(estados)]
+    inicial = min(range(estados), key=lambda indice: dist(puntos[indice],
+                                                          (0, 0)))
+    alcanzables = _alcanzables(vecinos, inicial)
+    objetivo = min(alcanzables, key=lambda indice: dist(puntos[indice],
+                                                        (ESCALA, ESCALA)))
+    coordenadas = {estado.nombre: punto
+                   for estado, punto in zip(lista, puntos)}
+    return _problema(lista, vecinos, inicial, objetivo,
+                     HeuristicaCoordenadas(coordenadas))
+
+
+def libre_escala(estados, semilla=0, enlaces=2):
+    """Grafo libre de escala (Barabási-Albert) sin heurística.
+
+    Cada estado nuevo se une a enlaces estados elegidos con probabilidad
+    proporcional a su grado, por lo que aparecen unos pocos estados muy
+    conectados. Las aristas van en los dos sentidos y cuestan de 1 a 10.
+    Se va del último estado añadido al de la mitad.
+    """
+    aleatorio = Random(semilla)
+    vecinos = [[] for _ in range(estados)]
+    extremos = []
+
+    def une(origen, destino):
+        coste = aleatorio.randint(1, 10)
+        vecinos[origen].append((destino, coste))
+        vecinos[destino].append((origen, coste))
+        extremos.extend((origen, destino))
+
+    for origen in range(enlaces + 1):
+        for destino in range(origen):
+            une(origen, destino)
+    for origen in range(enlaces + 1, estados):
+        destinos = set()
+        while len(destinos) < enlaces:
+            destinos.add(aleatorio.choice(extremos))
+        for destino in destinos:
+            une(origen, destino)
+    lista = [Estado(str(indice), []) for indice in range(estados)]
+    return _problema(lista, vecinos, estados - 1, estados // 2,
+                     heuristica_nula)
+
+
+def puzle(estados, semilla=0):
+    """Puzle deslizante con al menos el número de estados indicado.
+
+    Se elige el menor tablero de TABLEROS con tantos estados alcanzables
+    (la mitad de las permutaciones) y se desordena con movimientos al azar
+    desde la solución. Es un problema implícito con la distancia Manhattan
+    de las fichas como heurística.
+    """
+    filas, columnas = TABLEROS[-1]
+    for filas, columnas in TABLEROS:
+        if factorial(filas * columnas) // 2 >= estados:
+            break
+    casillas = filas * columnas
+    movimientos = {'Arriba': -columnas, 'Abajo': columnas, 'Izquierda': -1,
+                   'Derecha': 1}
+    opuestos = {'Arriba': 'Abajo', 'Abajo': 'Arriba',
+                'Izquierda': 'Derecha', 'Derecha': 'Izquierda'}
+    final = list(range(1, casillas)) + [0]
+
+    def mueve(fichas):
+        hueco = fichas.index(0)
+        for nombre, salto in movimientos.items():
+            destino = hueco + salto
+            if not 0 <= destino < casillas:
+                continue
+            if abs(salto) == 1 and destino // columnas != hueco // columnas:
+                continue
+            nuevas = list(fichas)
+            nuevas[hueco], nuevas[destino] = nuevas[destino], nuevas[hueco]
+            yield nombre, nuevas
+
+    def sucesores(estado):
+        fichas = [int(ficha) for ficha in estado.nombre.split(',')]
+        return {nombre: Estado(','.join(map(str, nuevas)), [])
+                for nombre, nuevas in mueve(fichas)}
+
+    def predecesores(estado):
+        return [(opuestos[nombre], destino)
+                for nombre, destino in sucesores(estado).items()]
+
+    def heuristica(estado):
+        total = 0
+        fichas = estado.nombre.split(',')
+        for posicion, ficha in enumerate(fichas):
+            ficha = int(ficha)
+            if ficha:
+                fila, columna = divmod(posicion, columnas)
+                fila_fin, columna_fin = divmod(ficha - 1, columnas)
+                total += abs(fila - fila_fin) + abs(columna - columna_fin)
+        return total
+
+    aleatorio = Random(semilla)
+    fichas = final
+    anterior = None
+    for _ in range(50 * casillas):
+        opciones = [(nombre, nuevas) for nombre, nuevas in mueve(fichas)
+                    if nombre != anterior]
+        nombre, fichas = aleatorio.choice(opciones)
+        anterior = opuestos[nombre]
+    inicial = Estado(','.join(map(str, fichas)), [])
+    objetivo = Estado(','.join(map(str, final)), [])
+    return ProblemaImplicito(inicial, sucesores, [objetivo],
+                             heuristica=heuristica,
+                             predecesores=predecesores)
+
+
+def heuristica_nula(estado, objetivo):
+    """Heurística que siempre vale 0 (admisible en cualquier problema)."""
+    return 0
+
+
+def _alcanzables(vecinos, origen):
+    """Índices de los estados alcanzables desde el origen."""
+    alcanzados = {origen}
+    pendientes = deque([origen])
+    while pendientes:
+        actual = pendientes.popleft()
+        for destino, _ in vecinos[actual]:
+            if destino not in alcanzados:
+                alcanzados.add(destino)
+                pendientes.append(destino)
+    return alcanzados
+
+
+def _problema(lista, vecinos, inicial, objetivo, heuristicas):
+    """Problema explícito a partir de las listas de vecinos con su coste."""
+    acciones = {}
+    costes = {}
+    for estado, aristas in zip(lista, vecinos):
+        acciones[estado.nombre] = {'a' + lista[destino].nombre: lista[destino]
+                                   for destino, _ in aristas}
+        costes[estado.nombre] = {'a' + lista[destino].nombre: coste
+                                 for destino, coste in aristas}
+    return Problema(lista[inicial], [lista[objetivo]], acciones, costes,
+                    heuristicas)
+
+
+# Generadores por nombre.
+GENERADORES = {
+    'rejilla': rejilla_pesos,
+    'geometrico': geometrico,
+    'libre_escala': libre_escala,
+    'puzle': puzle,
+}
+
+
+# %%
+if __name__ == '__main__':
+    from time import perf_counter
+
+    from informada import a_estrella
+
+    for estados in (10 ** 3, 10 ** 4):
+        for nombre, generador in GENERADORES.items():
+            inicio = perf_counter()
+            problema_generado = generador(estados)
+            creacion = perf_counter() - inicio
+            inicio = perf_counter()
+            solucion = a_estrella(problema_generado)
+            msg = "{0} {1}: creado en {2:.2f} s, A* coste {3} en {4:.2f} s"
+            print(msg.format(nombre, estados, creacion,
+                             solucion.coste if solucion else None,
+                             perf_counter() - inicio))
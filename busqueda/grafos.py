@@ -6,6 +6,12 @@ Estructura de Datos para Búsquedas.
 Curso del canal de Youtube 'Descubriendo la Inteligencia Artificial'.
 Autor: JL Iglesias Feria (jl.iglesias.feria@gmail.com)
 """
+from array import array
+from collections.abc import Mapping
+from heapq import heappop
+from heapq import heappush
+from math import dist
+from operator import attrgetter
 
 
 # %%
@@ -40,45 +46,222 @@ class Estado:
         """Representación del estado para depuración."""
         return "Estado({0})".format(self)
 
+    def __eq__(self, otro):
+        """Dos estados son iguales si tienen el mismo nombre."""
+        if self is otro:
+            return True
+        if not isinstance(otro, Estado):
+            return NotImplemented
+        return self.nombre == otro.nombre
+
+    def __hash__(self):
+        """Los estados con el mismo nombre tienen el mismo hash."""
+        return hash(self.nombre)
+
+
+# %%
+class RegistroEstados:
+    """Registro que asigna a cada estado un objeto único y un índice entero.
+
+    Los estados iguales (con el mismo nombre) se sustituyen siempre por el
+    primer objeto registrado, y cada uno recibe un índice consecutivo.
+    """
+
+    def __init__(self):
+        self.estados = []
+        self.indices = {}
+
+    def __len__(self):
+        """Número de estados registrados."""
+        return len(self.estados)
+
+    def __contains__(self, estado):
+        """Indica si el estado ya está registrado."""
+        return estado in self.indices
+
+    def __getitem__(self, indice):
+        """Devuelve el estado registrado con el índice indicado."""
+        return self.estados[indice]
+
+    def __iter__(self):
+        """Recorre los estados registrados en orden de registro."""
+        return iter(self.estados)
+
+    def __repr__(self):
+        """Representación del registro para depuración."""
+        return "RegistroEstados({0} estados)".format(len(self.estados))
+
+    def internar(self, estado):
+        """Registra el estado si es nuevo y devuelve su objeto único."""
+        return self.estados[self.indice(estado)]
+
+    def indice(self, estado):
+        """Devuelve el índice del estado, registrándolo si es nuevo."""
+        indice = self.indices.get(estado)
+        if indice is None:
+            indice = len(self.estados)
+            self.indices[estado] = indice
+            self.estados.append(estado)
+        return indice
+
 
 # %%
 class Problema:
-    """Problema a resolver con un grafo."""
+    """Problema a resolver con un grafo.
+
+    Los costes son un diccionario {estado: {accion: coste}}; si no se indican
+    todas las acciones cuestan 1. Las heurísticas pueden ser una tabla
+    {estado: {objetivo: heurística}}, en la que las entradas que faltan valen
+    infinito, o una función heuristicas(estado, objetivo). En ambos casos
+    sólo se calcula la heurística de los estados que se visitan.
+    Las tablas no se completan con los valores por defecto (antes se
+    rellenaban con 1 y con infinito), así que problema.costes y
+    problema.heuristicas sólo tienen lo indicado: los costes y heurísticas
+    se consultan con coste_accion y heuristica_objetivo.
+    Si se le asigna un contexto (contexto.ContextoBusqueda) las búsquedas
+    respetan su plazo, su máximo de nodos y su cancelación.
+    """
 
     def __init__(self, estado_inicial, estados_objetivos, acciones,
-                 costes=None, heuristicas=None, infinito=99999):
+                 costes=None, heuristicas=None, infinito=99999,
+                 nodos_ligeros=False):
+        self.compilado = None
         self.estado_inicial = estado_inicial
         self.estados_objetivos = estados_objetivos
         self.acciones = acciones
-        self.costes = costes
-        self.heuristicas = heuristicas
+        self.costes = costes or {}
+        self.costes_unitarios = not costes
+        self.heuristicas = heuristicas or {}
         self.infinito = infinito
-        if not self.costes:
-            self.costes = {}
-            for estado in self.acciones.keys():
-                self.costes[estado] = {}
-                for accion in self.acciones[estado].keys():
-                    self.costes[estado][accion] = 1
-        if not self.heuristicas:
-            self.heuristicas = {}
-            for estado in self.acciones.keys():
-                self.heuristicas[estado] = {}
-                for objetivo in self.estados_objetivos:
-                    self.heuristicas[estado][objetivo] = self.infinito
+        self.nodos_ligeros = nodos_ligeros
+        self.inversas = None
+        self.hitos = None
+        self.contexto = None
 
     def __str__(self):
         """Representación en modo texto del problema."""
         msg = "Estado Inicial: {0}; Objetivos: {1}"
         return msg.format(self.estado_inicial.nombre,
-                          self.estados_objetivos)
+                          list(self.estados_objetivos))
 
     def __repr__(self):
         """Representación del problema para depuración."""
         return "Problema({0})".format(self)
 
+    @property
+    def estados_objetivos(self):
+        """Tupla (inmutable) de los estados objetivos del problema."""
+        return self.__estados_objetivos
+
+    @estados_objetivos.setter
+    def estados_objetivos(self, estados_objetivos):
+        """Cambia los objetivos y rehace sus índices y cachés."""
+        estados_objetivos = tuple(estados_objetivos)
+        self.__estados_objetivos = estados_objetivos
+        self.objetivos = set(estados_objetivos)
+        self.nombres_objetivos = {objetivo.nombre: objetivo
+                                  for objetivo in estados_objetivos}
+        self.cache_heuristicas = {}
+        if self.compilado is not None:
+            self.compilado.calcular_heuristicas(self)
+
+    @property
+    def hitos(self):
+        """Heurística de hitos que sustituye a la tabla de heurísticas."""
+        return self.__hitos
+
+    @hitos.setter
+    def hitos(self, hitos):
+        """Cambia la heurística de hitos (None para usar la tabla)."""
+        self.__hitos = hitos
+        self.cache_heuristicas = {}
+        if self.compilado is not None:
+            self.compilado.calcular_heuristicas(self)
+
     def es_objetivo(self, estado):
         """Indica si el estado indicado es uno de los estados objetivos."""
-        return estado in self.estados_objetivos
+        return estado in self.objetivos
+
+    def acciones_estado(self, estado):
+        """Devuelve las acciones posibles en un estado y su estado destino."""
+        return self.acciones.get(estado.nombre, {})
+
+    def predecesores_estado(self, estado):
+        """Devuelve las acciones que llevan al estado indicado.
+
+        Es una lista de parejas (nombre_accion, estado_origen). El índice
+        inverso de acciones se construye la primera vez que se necesita.
+        """
+        if self.inversas is None:
+            conocidos = {self.estado_inicial.nombre: self.estado_inicial}
+            for acciones_estado in self.acciones.values():
+                for destino in acciones_estado.values():
+                    conocidos.setdefault(destino.nombre, destino)
+            self.inversas = {}
+            for nombre, acciones_estado in self.acciones.items():
+                origen = conocidos.get(nombre) or Estado(nombre, [])
+                for nombre_accion, destino in acciones_estado.items():
+                    inversas_destino = self.inversas.setdefault(
+                        destino.nombre, [])
+                    inversas_destino.append((nombre_accion, origen))
+        return self.inversas.get(estado.nombre, [])
+
+    def heuristicas_estado(self, estado):
+        """Devuelve las heurísticas del estado indicadas por objetivo."""
+        if self.hitos is not None:
+            return self.hitos.heuristicas_estado(estado,
+                                                 self.estados_objetivos)
+        if callable(self.heuristicas):
+            return {objetivo.nombre: self.heuristicas(estado, objetivo)
+                    for objetivo in self.estados_objetivos}
+        return self.heuristicas.get(estado.nombre, {})
+
+    def heuristica_objetivo(self, estado, objetivo):
+        """Devuelve la heurística del estado a uno de los objetivos."""
+        if self.contexto:
+            self.contexto.evaluar()
+        if self.hitos is not None:
+            return self.hitos.heuristica(estado, objetivo)
+        if callable(self.heuristicas):
+            return self.heuristicas(estado, objetivo)
+        heuristicas_estado = self.heuristicas.get(estado.nombre, {})
+        return heuristicas_estado.get(objetivo.nombre, self.infinito)
+
+    def heuristica(self, estado):
+        """Devuelve la menor heurística del estado a los estados objetivos.
+
+        Se calcula una sola vez por estado y se guarda para las siguientes.
+        Sin objetivos es 0.
+        """
+        heuristica = self.cache_heuristicas.get(estado)
+        if heuristica is None:
+            heuristica = min((self.heuristica_objetivo(estado, objetivo)
+                              for objetivo in self.estados_objetivos),
+                             default=0)
+            self.cache_heuristicas[estado] = heuristica
+        return heuristica
+
+    def heuristica_inicial(self, estado):
+        """Estimación del coste desde el estado inicial hasta el estado.
+
+        Es la heurística que usan las búsquedas hacia atrás. Con una tabla
+        de heurísticas se usa la diferencia entre la heurística del estado
+        inicial y la del estado, que es consistente si la tabla lo es. Si
+        falta alguna de las dos se usa 0, que nunca sobreestima.
+        """
+        if self.hitos is not None:
+            if self.contexto:
+                self.contexto.evaluar()
+            return self.hitos.heuristica(self.estado_inicial, estado)
+        if callable(self.heuristicas):
+            if self.contexto:
+                self.contexto.evaluar()
+            return self.heuristicas(self.estado_inicial, estado)
+        heuristica_inicial = self.heuristica(self.estado_inicial)
+        heuristica = self.heuristica(estado)
+        if heuristica_inicial >= self.infinito or heuristica >= self.infinito:
+            return 0
+        return max(0, heuristica_inicial - heuristica)
 
     def resultado(self, estado, accion):
         """Nuevo estado de aplicar acción indicada en estado actual."""
@@ -91,6 +274,10 @@ class Problema:
 
     def coste_accion(self, estado, accion):
         """Devuelve el coste de aplicar una acción en un estado."""
+        if self.costes_unitarios:
+            if accion.nombre not in self.acciones.get(estado.nombre, {}):
+                return self.infinito
+            return 1
         if estado.nombre not in self.costes.keys():
             return self.infinito
         costes_estado = self.costes[estado.nombre]
@@ -99,13 +286,356 @@ class Problema:
         return costes_estado[accion.nombre]
 
     def coste_camino(self, nodo):
-        """Devuelve el coste total de recorrer el camino hasta un estado."""
-        total = 0
-        while nodo.padre:
-            total += self.coste_accion(nodo.padre.estado, nodo.accion)
+        """Devuelve el coste total de recorrer el camino hasta un estado.
+
+        Es el coste guardado en el nodo. Sólo si algún nodo del camino aún no
+        lo tiene (coste None) se calcula a partir del primer antecesor que sí
+        lo tiene, y se guarda en cada nodo para no volver a recorrerlo.
+        """
+        pendientes = []
+        while nodo.coste is None:
+            pendientes.append(nodo)
             nodo = nodo.padre
+        total = nodo.coste
+        for nodo in reversed(pendientes):
+            total += self.coste_accion(nodo.padre.estado, nodo.accion)
+            nodo.coste = total
         return total
 
+    def compilar(self):
+        """Devuelve el grafo del problema compilado con índices enteros."""
+        if self.compilado is None:
+            self.compilado = GrafoCompilado(self)
+        return self.compilado
+
+
+# %%
+class ProblemaImplicito(Problema):
+    """Problema cuyo grafo se genera bajo demanda mediante funciones.
+
+    En lugar de los diccionarios de acciones, costes y heurísticas recibe:
+    - sucesores(estado): diccionario {nombre_accion: estado_destino}.
+    - coste(estado, nombre_accion): coste de la acción (por defecto 1).
+    - objetivo(estado): si el estado es objetivo (por defecto, si está entre
+      los estados objetivos).
+    - heuristica(estado): heurística del estado (por defecto 0).
+    - predecesores(estado): lista de parejas (nombre_accion, estado_origen)
+      de las acciones que llevan al estado (para búsquedas hacia atrás).
+    Los estados generados se internan en un registro para que un mismo
+    estado generado dos veces sea siempre el mismo objeto, y sólo se guardan
+    los que se visitan.
+    """
+
+    def __init__(self, estado_inicial, sucesores, estados_objetivos=None,
+                 coste=None, objetivo=None, heuristica=None,
+                 predecesores=None, infinito=99999, nodos_ligeros=False):
+        self.registro = RegistroEstados()
+        super().__init__(self.registro.internar(estado_inicial),
+                         [self.registro.internar(estado)
+                          for estado in estados_objetivos or []],
+                         None, infinito=infinito, nodos_ligeros=nodos_ligeros)
+        self.costes_unitarios = coste is None
+        self.sucesores = sucesores
+        self.funcion_coste = coste
+        self.funcion_objetivo = objetivo
+        self.funcion_heuristica = heuristica
+        self.predecesores = predecesores
+        self.ultimo_estado = None
+        self.ultimos_sucesores = {}
+
+    def __repr__(self):
+        """Representación del problema para depuración."""
+        return "ProblemaImplicito({0})".format(self)
+
+    def es_objetivo(self, estado):
+        """Indica si el estado indicado es uno de los estados objetivos."""
+        if self.funcion_objetivo:
+            return self.funcion_objetivo(estado)
+        return estado in self.objetivos
+
+    def acciones_estado(self, estado):
+        """Genera las acciones posibles en un estado y su estado destino."""
+        if estado is not self.ultimo_estado:
+            self.ultimos_sucesores = {
+                nombre_accion: self.registro.internar(destino)
+                for nombre_accion, destino in self.sucesores(estado).items()}
+            self.ultimo_estado = estado
+        return self.ultimos_sucesores
+
+    def resultado(self, estado, accion):
+        """Nuevo estado de aplicar acción indicada en estado actual."""
+        return self.acciones_estado(estado).get(accion.nombre)
+
+    def predecesores_estado(self, estado):
+        """Devuelve las acciones que llevan al estado indicado."""
+        if not self.predecesores:
+            raise NotImplementedError("El problema no indica predecesores")
+        return [(nombre_accion, self.registro.internar(origen))
+                for nombre_accion, origen in self.predecesores(estado)]
+
+    def coste_accion(self, estado, accion):
+        """Devuelve el coste de aplicar una acción en un estado."""
+        if self.funcion_coste:
+            return self.funcion_coste(estado, accion.nombre)
+        return 1
+
+    def heuristicas_estado(self, estado):
+        """Devuelve las heurísticas del estado indicadas por objetivo."""
+        heuristica = self.heuristica(estado)
+        return {objetivo.nombre: heuristica
+                for objetivo in self.estados_objetivos}
+
+    def heuristica_objetivo(self, estado, objetivo):
+        """Devuelve la heurística del estado (igual para todo objetivo)."""
+        return self.heuristica(estado)
+
+    def heuristica(self, estado):
+        """Devuelve la heurística del estado."""
+        if self.funcion_heuristica:
+            if self.contexto:
+                self.contexto.evaluar()
+            return self.funcion_heuristica(estado)
+        return 0
+
+    def compilar(self):
+        """Los problemas implícitos no tienen un grafo que compilar."""
+        raise NotImplementedError("Un problema implícito no se puede compilar")
+
+
+# %%
+class GrafoCompilado:
+    """Grafo de un problema con los estados numerados y aristas en arrays.
+
+    Las aristas se guardan en formato CSR (Compressed Sparse Row): las
+    aristas del estado i son las posiciones de inicios[i] a inicios[i + 1]
+    de los arrays destinos, costes y acciones.
+    """
+
+    def __init__(self, problema):
+        self.registro = RegistroEstados()
+        self.estados = self.registro.estados
+        self.nombres_acciones = []
+        indices_acciones = {}
+        for acciones_estado in problema.acciones.values():
+            for estado in acciones_estado.values():
+                self.registro.internar(estado)
+        self.registro.internar(problema.estado_inicial)
+        for objetivo in problema.estados_objetivos:
+            self.registro.internar(objetivo)
+        for nombre in problema.acciones.keys():
+            self.registro.internar(Estado(nombre, []))
+        costes_estados = [problema.costes.get(estado.nombre, {})
+                          for estado in self.estados]
+        enteros = all(isinstance(coste, int)
+                      for costes_estado in costes_estados
+                      for coste in costes_estado.values())
+        self.inicios = array('l', [0])
+        self.destinos = array('l')
+        self.costes = array('q' if enteros else 'd')
+        self.acciones = array('l')
+        for estado, costes_estado in zip(self.estados, costes_estados):
+            acciones_estado = problema.acciones.get(estado.nombre, {})
+            for nombre_accion, destino in acciones_estado.items():
+                if nombre_accion not in indices_acciones:
+                    indices_acciones[nombre_accion] = len(
+                        self.nombres_acciones)
+                    self.nombres_acciones.append(nombre_accion)
+                self.destinos.append(self.registro.indice(destino))
+                if problema.costes_unitarios:
+                    self.costes.append(1)
+                else:
+                    self.costes.append(costes_estado.get(nombre_accion,
+                                                         problema.infinito))
+                self.acciones.append(indices_acciones[nombre_accion])
+            self.inicios.append(len(self.destinos))
+        self.calcular_heuristicas(problema)
+
+    def __str__(self):
+        """Representación en modo texto del grafo compilado."""
+        msg = "{0} estados, {1} aristas"
+        return msg.format(len(self.estados), len(self.destinos))
+
+    def __repr__(self):
+        """Representación del grafo compilado para depuración."""
+        return "GrafoCompilado({0})".format(self)
+
+    def indice(self, estado):
+        """Devuelve el índice entero del estado indicado."""
+        return self.registro.indices[estado]
+
+    def calcular_heuristicas(self, problema):
+        """Calcula la menor heurística de cada estado a los objetivos."""
+        if not problema.estados_objetivos:
+            self.heuristicas = array('d', [0]) * len(self.estados)
+            return
+        self.heuristicas = array('d', [problema.heuristica(estado)
+                                       for estado in self.estados])
+
+    def buscar(self, origen, objetivos, heuristica=None, contexto=None,
+               todos=False):
+        """Búsqueda de coste uniforme desde el estado origen sobre los arrays.
+
+        Con una función heuristica(indice) es una búsqueda A*. Se detiene en
+        el primer estado de objetivos que sale de la frontera o, si todos es
+        True, cuando han salido todos. Devuelve (alcanzados, padres, aristas,
+        interrumpido): el diccionario {objetivo: coste} de los objetivos
+        alcanzados, los arrays para reconstruir sus caminos y el estado en el
+        que se agotó el contexto (-1 si no se agotó).
+        """
+        total = len(self.estados)
+        pendientes = set(objetivos)
+        alcanzados = {}
+        padres = array('l', [-1]) * total
+        aristas = array('l', [-1]) * total
+        distancias = array('d', [float('inf')]) * total
+        explorados = bytearray(total)
+        inicios = self.inicios
+        destinos = self.destinos
+        costes = self.costes
+        distancias[origen] = 0
+        frontera = [(heuristica(origen) if heuristica else 0, 0, origen)]
+        while frontera:
+            _, distancia, actual = heappop(frontera)
+            if explorados[actual]:
+                continue
+            if actual in pendientes:
+                alcanzados[actual] = distancia
+                pendientes.discard(actual)
+                if not todos or not pendientes:
+                    break
+            if contexto and contexto.agotado(
+                    actual, len(frontera),
+                    generados=inicios[actual + 1] - inicios[actual]):
+                return alcanzados, padres, aristas, actual
+            explorados[actual] = 1
+            for arista in range(inicios[actual], inicios[actual + 1]):
+                destino = destinos[arista]
+                nueva = distancia + costes[arista]
+                if nueva < distancias[destino] and not explorados[destino]:
+                    distancias[destino] = nueva
+                    padres[destino] = actual
+                    aristas[destino] = arista
+                    if heuristica:
+                        heappush(frontera, (nueva + heuristica(destino),
+                                            nueva, destino))
+                    else:
+                        heappush(frontera, (nueva, nueva, destino))
+        return alcanzados, padres, aristas, -1
+
+    def camino(self, destino, padres, aristas):
+        """Devuelve el estado origen y las aristas del camino hasta destino.
+
+        Los arrays padres y aristas indican, para cada estado alcanzado, el
+        estado anterior y la arista usada para llegar a él (-1 en el origen).
+        """
+        camino = []
+        actual = destino
+        while padres[actual] != -1:
+            camino.append(aristas[actual])
+            actual = padres[actual]
+        camino.reverse()
+        return actual, camino
+
+    def reconstruir(self, problema, destino, padres, aristas):
+        """Crea la cadena de nodos que lleva hasta el estado destino."""
+        origen, camino = self.camino(destino, padres, aristas)
+        return self.nodos_camino(problema, origen, camino)
+
+    def nodos_camino(self, problema, origen, camino):
+        """Crea la cadena de nodos que recorre las aristas indicadas.
+
+        El camino es la lista de índices de las aristas que se siguen desde
+        el estado con índice origen. Devuelve el nodo del último estado.
+        """
+        estado = self.estados[origen]
+        if problema.nodos_ligeros:
+            nodo = NodoLigero(estado)
+        else:
+            nodo = self.__nodo_completo(problema, estado, None, None, 0)
+        coste = 0
+        for arista in camino:
+            estado = self.estados[self.destinos[arista]]
+            accion = Accion(self.nombres_acciones[self.acciones[arista]])
+            coste += self.costes[arista]
+            if problema.nodos_ligeros:
+                nodo = NodoLigero(estado, nodo, accion, coste)
+            else:
+                nodo = self.__nodo_completo(problema, estado, accion, nodo,
+                                            coste)
+        return nodo
+
+    def __nodo_completo(self, problema, estado, accion, padre, coste):
+        """Crea un nodo con sus acciones, heurísticas y valores."""
+        nodo = Nodo(estado, accion, problema.acciones_estado(estado), padre)
+        nodo.coste = coste
+        nodo.evaluar(problema)
+        if padre:
+            padre.hijos.append(nodo)
+        return nodo
+
+
+# %%
+class HeuristicaCoordenadas:
+    """Heurística a partir de las coordenadas de cada estado.
+
+    Se usa como función heuristicas(estado, objetivo) del problema: mide la
+    distancia entre las coordenadas de los dos estados (por defecto la
+    distancia euclídea), o 0 si falta alguna de ellas.
+    """
+
+    def __init__(self, coordenadas, distancia=dist):
+        self.coordenadas = coordenadas
+        self.distancia = distancia
+
+    def __call__(self, estado, objetivo):
+        """Distancia entre las coordenadas del estado y del objetivo."""
+        if(estado.nombre not in self.coordenadas or
+           objetivo.nombre not in self.coordenadas):
+            return 0
+        return self.distancia(self.coordenadas[estado.nombre],
+                              self.coordenadas[objetivo.nombre])
+
+    def __repr__(self):
+        """Representación de la heurística para depuración."""
+        return "HeuristicaCoordenadas({0} estados)".format(
+            len(self.coordenadas))
+
+
+class HeuristicasNodo(Mapping):
+    """Heurísticas de un nodo por nombre de objetivo, calculadas al pedirlas.
+
+    Si se indica un coste devuelve los valores (coste + heurística). Las
+    heurísticas ya calculadas se pueden compartir con otro objeto.
+    """
+
+    def __init__(self, problema, estado, coste=0, calculadas=None):
+        self.problema = problema
+        self.estado = estado
+        self.coste = coste
+        self.calculadas = {} if calculadas is None else calculadas
+
+    def __getitem__(self, nombre):
+        """Heurística (o valor) del estado al objetivo con ese nombre."""
+        heuristica = self.calculadas.get(nombre)
+        if heuristica is None:
+            objetivo = self.problema.nombres_objetivos.get(nombre)
+            heuristica = self.problema.heuristica_objetivo(
+                self.estado, objetivo or Estado(nombre, []))
+            self.calculadas[nombre] = heuristica
+        return heuristica + self.coste
+
+    def __iter__(self):
+        """Recorre los nombres de los objetivos del problema."""
+        return iter(self.problema.nombres_objetivos)
+
+    def __len__(self):
+        """Número de objetivos del problema."""
+        return len(self.problema.nombres_objetivos)
+
+    def __repr__(self):
+        """Representación de las heurísticas para depuración."""
+        return "HeuristicasNodo({0})".format(dict(self))
+
 
 # %%
 class Nodo:
@@ -121,12 +651,21 @@ class Nodo:
         self.padre = padre
         self.hijos = []
         self.hijos.extend(hijos)
-        self.coste = 0
+        self.coste = 0 if padre is None else None
         self.heuristicas = {}
         self.valores = {}
         self.alfa = 0
         self.beta = 0
 
+    def evaluar(self, problema):
+        """Prepara las heurísticas y valores del nodo según su coste.
+
+        No se calcula ninguna heurística hasta que se consulta.
+        """
+        self.heuristicas = HeuristicasNodo(problema, self.estado)
+        self.valores = HeuristicasNodo(problema, self.estado, self.coste,
+                                       self.heuristicas.calculadas)
+
     def __str__(self):
         """Representación en modo texto del nodo."""
         return self.estado.nombre
@@ -139,23 +678,18 @@ class Nodo:
         """Crea todos los nodos hijos aplicando todas las acciones posibles."""
         self.hijos = []
         if not self.acciones:
-            if self.estado.nombre not in problema.acciones.keys():
+            self.acciones = problema.acciones_estado(self.estado)
+            if not self.acciones:
                 return self.hijos
-            self.acciones = problema.acciones[self.estado.nombre]
         for accion in self.acciones.keys():
             accion_hijo = Accion(accion)
             nuevo_estado = problema.resultado(self.estado, accion_hijo)
-            acciones_nuevo = {}
-            if nuevo_estado.nombre in problema.acciones.keys():
-                acciones_nuevo = problema.acciones[nuevo_estado.nombre]
+            acciones_nuevo = problema.acciones_estado(nuevo_estado)
             hijo = Nodo(nuevo_estado, accion_hijo, acciones_nuevo, self)
-            coste = self.padre.coste if self.padre else 0
+            coste = problema.coste_camino(self)
             coste += problema.coste_accion(self.estado, accion_hijo)
             hijo.coste = coste
-            hijo.heuristicas = problema.heuristicas[hijo.estado.nombre]
-            hijo.valores = {estado: heuristica + hijo.coste
-                            for estado, heuristica
-                            in hijo.heuristicas.items()}
+            hijo.evaluar(problema)
             self.hijos.append(hijo)
         return self.hijos
 
@@ -163,51 +697,51 @@ class Nodo:
         """Devuelve hijo con menor cantidad según un criterio."""
         if not self.hijos:
             return None
-        mejor = self.hijos[0]
-        for hijo in self.hijos:
-            for objetivo in problema.estados_objetivos:
-                if metrica == 'valor':
-                    valor_hijo = hijo.valores[objetivo.nombre]
-                    valor_mejor = mejor.valores[objetivo.nombre]
-                    if(criterio == 'menor' and
-                       valor_hijo < valor_mejor):
-                        mejor = hijo
-                    elif(criterio == 'mayor' and
-                         valor_hijo > valor_mejor):
-                        mejor = hijo
-                elif metrica == 'heuristica':
-                    heuristica_hijo = hijo.heuristicas[objetivo.nombre]
-                    heuristica_mejor = mejor.heuristicas[objetivo.nombre]
-                    if(criterio == 'menor' and
-                       heuristica_hijo < heuristica_mejor):
-                        mejor = hijo
-                    elif(criterio == 'mayor' and
-                         heuristica_hijo > heuristica_mejor):
-                        mejor = hijo
-                elif metrica == 'coste':
-                    coste_camino_hijo = problema.coste_camino(hijo)
-                    coste_camino_mejor = problema.coste_camino(mejor)
-                    if(criterio == 'menor' and
-                       coste_camino_hijo < coste_camino_mejor):
-                        mejor = hijo
-                    elif(criterio == 'mayor' and
-                         coste_camino_hijo > coste_camino_mejor):
-                        mejor = hijo
-                elif metrica == 'alfa':
-                    if(criterio == 'menor' and
-                       hijo.alfa < mejor.alfa):
-                        mejor = hijo
-                    elif(criterio == 'mayor' and
-                         hijo.alfa > mejor.alfa):
-                        mejor = hijo
-                elif metrica == 'beta':
-                    if(criterio == 'menor' and
-                       hijo.beta < mejor.beta):
-                        mejor = hijo
-                    elif(criterio == 'mayor' and
-                         hijo.beta > mejor.beta):
-                        mejor = hijo
-        return mejor
+        nombres = [objetivo.nombre for objetivo in problema.estados_objetivos]
+        if metrica == 'valor':
+            def clave(hijo):
+                return min((hijo.valores[nombre] for nombre in nombres),
+                           default=hijo.coste)
+        elif metrica == 'heuristica':
+            def clave(hijo):
+                return min((hijo.heuristicas[nombre] for nombre in nombres),
+                           default=0)
+        elif metrica == 'coste':
+            clave = problema.coste_camino
+        elif metrica == 'alfa':
+            clave = attrgetter('alfa')
+        elif metrica == 'beta':
+            clave = attrgetter('beta')
+        else:
+            raise ValueError("Métrica desconocida: {0}".format(metrica))
+        if criterio == 'mayor':
+            return max(self.hijos, key=clave)
+        return min(self.hijos, key=clave)
+
+
+# %%
+class NodoLigero:
+    """Nodo compacto que sólo guarda el estado, el padre, la acción y el coste.
+
+    No guarda la lista de hijos, por lo que los nodos descartados por la
+    búsqueda pueden liberarse en lugar de quedar colgando del nodo raíz.
+    """
+
+    __slots__ = ('estado', 'padre', 'accion', 'coste')
+
+    def __init__(self, estado, padre=None, accion=None, coste=0):
+        self.estado = estado
+        self.padre = padre
+        self.accion = accion
+        self.coste = coste
+
+    def __str__(self):
+        """Representación en modo texto del nodo."""
+        return self.estado.nombre
+
+    def __repr__(self):
+        """Representación del nodo para depuración."""
+        return "NodoLigero({0})".format(self)
 
 
 # %%
@@ -379,7 +913,7 @@ if __name__ == '__main__':
     nodo_faro.hijos.append(nodo_sevilla)
     kms = problema_faro_bcn.coste_camino(nodo_sevilla)
     print("Coste: {0}".format(kms))
-    heuristica = problema_faro_bcn.heuristicas['Sevilla']['Barcelona']
+    heuristica = problema_faro_bcn.heuristica_objetivo(sevilla, barcelona)
     print("Heurística: {0}".format(heuristica))
     valor = heuristica + kms
     print("Valor: {0}".format(valor))
@@ -398,7 +932,7 @@ if __name__ == '__main__':
     nodo_sevilla.hijos.append(nodo_madrid)
     kms = problema_faro_bcn.coste_camino(nodo_madrid)
     print("Coste: {0}".format(kms))
-    heuristica = problema_faro_bcn.heuristicas['Madrid']['Barcelona']
+    heuristica = problema_faro_bcn.heuristica_objetivo(madrid, barcelona)
     print("Heurística: {0}".format(heuristica))
     valor = heuristica + kms
     print("Valor: {0}".format(valor))
@@ -419,7 +953,7 @@ if __name__ == '__main__':
     nodo_madrid.hijos.append(nodo_valencia)
     kms = problema_faro_bcn.coste_camino(nodo_valencia)
     print("Coste: {0}".format(kms))
-    heuristica = problema_faro_bcn.heuristicas['Valencia']['Barcelona']
+    heuristica = problema_faro_bcn.heuristica_objetivo(valencia, barcelona)
     print("Heurística: {0}".format(heuristica))
     valor = heuristica + kms
     print("Valor: {0}".format(valor))
@@ -438,7 +972,7 @@ if __name__ == '__main__':
     nodo_valencia.hijos.append(nodo_barcelona)
     kms = problema_faro_bcn.coste_camino(nodo_barcelona)
     print("Coste: {0}".format(kms))
-    heuristica = problema_faro_bcn.heuristicas['Barcelona']['Barcelona']
+    heuristica = problema_faro_bcn.heuristica_objetivo(barcelona, barcelona)
     print("Heurística: {0}".format(heuristica))
     valor = heuristica + kms
     print("Valor: {0}".format(valor))
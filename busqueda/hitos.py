@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Heurísticas de hitos (ALT: A*, Landmarks, Triangle inequality).
+
+Curso del canal de Youtube 'Descubriendo la Inteligencia Artificial'.
+Autor: JL Iglesias Feria (jl.iglesias.feria@gmail.com)
+"""
+from array import array
+from heapq import heappop
+from heapq import heappush
+from random import Random
+
+INFINITO = float('inf')
+
+
+# %%
+class Hitos:
+    """Heurística calculada a partir de las distancias a unos pocos hitos.
+
+    Se eligen k estados (hitos) y se guardan las distancias de cada hito a
+    todos los estados y de todos los estados a cada hito, en arrays de k x n
+    números en lugar de una tabla de n x objetivos. Por la desigualdad
+    triangular, para cualquier hito L:
+        d(v, t) >= d(L, t) - d(L, v)
+        d(v, t) >= d(v, L) - d(t, L)
+    y el máximo de estas cotas es una heurística admisible (y consistente).
+
+    Estrategias para elegir los hitos:
+    - 'lejanos': cada hito es el estado más alejado de los ya elegidos.
+    - 'evitar': cada hito es la hoja de la rama del árbol de caminos mínimos
+      desde un estado al azar peor cubierta por los hitos ya elegidos.
+
+    Para usarla en las búsquedas informadas basta con asignarla al problema:
+        problema.hitos = Hitos(problema, 8)
+    """
+
+    def __init__(self, problema, total=8, estrategia='lejanos', semilla=0):
+        if estrategia not in ('lejanos', 'evitar'):
+            raise ValueError("Estrategia desconocida: {0}".format(estrategia))
+        self.grafo = problema.compilar()
+        self.estrategia = estrategia
+        self.aleatorio = Random(semilla)
+        self.hitos = []
+        self.desde = []
+        self.hasta = []
+        self.inversas = self.__invertir()
+        total = min(total, len(self.grafo.estados))
+        while len(self.hitos) < total:
+            hito = None
+            if estrategia == 'evitar':
+                hito = self.__hito_evitar()
+            if hito is None:
+                hito = self.__hito_lejano(problema)
+            if hito is None:
+                break
+            self.hitos.append(hito)
+            grafo = self.grafo
+            self.desde.append(
+                _distancias(grafo.inicios, grafo.destinos, grafo.costes,
+                            hito)[0])
+            self.hasta.append(
+                _distancias(*self.inversas, hito)[0])
+
+    def __str__(self):
+        """Representación en modo texto de los hitos."""
+        return str([self.grafo.estados[hito].nombre for hito in self.hitos])
+
+    def __repr__(self):
+        """Representación de los hitos para depuración."""
+        return "Hitos({0})".format(self)
+
+    def estimar(self, origen, destino):
+        """Cota inferior del coste entre dos estados (por su índice)."""
+        mejor = 0
+        for desde, hasta in zip(self.desde, self.hasta):
+            hacia_destino = desde[destino] - desde[origen]
+            if hacia_destino > mejor and desde[origen] != INFINITO:
+                mejor = hacia_destino
+            desde_origen = hasta[origen] - hasta[destino]
+            if desde_origen > mejor and hasta[destino] != INFINITO:
+                mejor = desde_origen
+        return mejor
+
+    def heuristica(self, estado, objetivo):
+        """Cota inferior del coste para ir del estado al objetivo."""
+        indices = self.grafo.registro.indices
+        if estado not in indices or objetivo not in indices:
+            return 0
+        return self.estimar(indices[estado], indices[objetivo])
+
+    def heuristicas_estado(self, estado, objetivos):
+        """Heurísticas del estado indicadas por nombre de objetivo."""
+        return {objetivo.nombre: self.heuristica(estado, objetivo)
+                for objetivo in objetivos}
+
+    def __invertir(self):
+        """Arrays CSR del grafo con las aristas invertidas."""
+        grafo = self.grafo
+        total = len(grafo.estados)
+        entrantes = [[] for _ in range(total)]
+        for origen in range(total):
+            for arista in range(grafo.inicios[origen],
+                                grafo.inicios[origen + 1]):
+                entrantes[grafo.destinos[arista]].append(
+                    (origen, grafo.costes[arista]))
+        inicios = array('l', [0])
+        destinos = array('l')
+        costes = array(grafo.costes.typecode)
+        for aristas in entrantes:
+            for origen, coste in aristas:
+                destinos.append(origen)
+                costes.append(coste)
+            inicios.append(len(destinos))
+        return inicios, destinos, costes
+
+    def __hito_lejano(self, problema):
+        """El estado más alejado (en ambos sentidos) de los hitos elegidos.
+
+        El primer hito es el más alejado del estado inicial. Los estados que
+        no se alcanzan desde ningún hito se consideran los más alejados.
+        """
+        if not self.hitos:
+            inicio = self.grafo.indice(problema.estado_inicial)
+            distancias = _distancias(self.grafo.inicios, self.grafo.destinos,
+                                     self.grafo.costes, inicio)[0]
+            cercanias = [distancia if distancia != INFINITO else -1
+                         for distancia in distancias]
+        else:
+            cercanias = [min(min(desde[estado], hasta[estado])
+                             for desde, hasta in zip(self.desde, self.hasta))
+                         for estado in range(len(self.grafo.estados))]
+            for hito in self.hitos:
+                cercanias[hito] = -1
+        lejano = max(range(len(cercanias)), key=cercanias.__getitem__)
+        return None if cercanias[lejano] <= 0 else lejano
+
+    def __hito_evitar(self):
+        """Hoja de la rama peor cubierta del árbol de caminos mínimos.
+
+        El peso de cada estado es lo que falta a la heurística actual para
+        llegar a su distancia real desde la raíz. Las ramas que ya contienen
+        un hito no cuentan. Se baja desde la raíz por el hijo de mayor peso
+        acumulado hasta llegar a una hoja (None si todas están cubiertas).
+        """
+        grafo = self.grafo
+        raiz = self.aleatorio.randrange(len(grafo.estados))
+        distancias, padres, orden = _distancias(grafo.inicios, grafo.destinos,
+                                                grafo.costes, raiz)
+        cubiertos = set(self.hitos)
+        tamanos = {estado: distancias[estado] - self.estimar(raiz, estado)
+                   for estado in orden}
+        hijos = {estado: [] for estado in orden}
+        for estado in reversed(orden):
+            if estado in cubiertos:
+                tamanos[estado] = 0
+            padre = padres[estado]
+            if padre != -1:
+                hijos[padre].append(estado)
+                if estado in cubiertos:
+                    cubiertos.add(padre)
+                tamanos[padre] += tamanos[estado]
+        actual = raiz
+        while hijos[actual]:
+            siguiente = max(hijos[actual], key=tamanos.__getitem__)
+            if tamanos[siguiente] <= 0:
+                break
+            actual = siguiente
+        if actual == raiz:
+            return None
+        return actual
+
+
+def _distancias(inicios, destinos, costes, origen):
+    """Búsqueda de coste uniforme desde el origen a todos los estados.
+
+    Devuelve las distancias (infinito si no se alcanza), el estado anterior
+    en el camino mínimo (-1 en el origen) y el orden en que se cierran.
+    """
+    total = len(inicios) - 1
+    distancias = array('d', [INFINITO]) * total
+    padres = array('l', [-1]) * total
+    cerrados = bytearray(total)
+    orden = []
+    distancias[origen] = 0
+    frontera = [(0, origen)]
+    while frontera:
+        distancia, actual = heappop(frontera)
+        if cerrados[actual]:
+            continue
+        cerrados[actual] = 1
+        orden.append(actual)
+        for arista in range(inicios[actual], inicios[actual + 1]):
+            destino = destinos[arista]
+            nueva = distancia + costes[arista]
+            if nueva < distancias[destino]:
+                distancias[destino] = nueva
+                padres[destino] = actual
+                heappush(frontera, (nueva, destino))
+    return distancias, padres, orden
+
+
+# %%
+if __name__ == '__main__':
+    from informada import a_estrella
+    from noinformada import coste_uniforme
+    from rendimiento import cuenta_expansiones
+    from rendimiento import rejilla
+
+    LADO = 40
+    problema_rejilla = rejilla(LADO)
+
+    print("***** COSTE UNIFORME EN REJILLA {0}x{0} *****".format(LADO))
+    solucion, expansiones = cuenta_expansiones(coste_uniforme,
+                                               problema_rejilla)
+    print("Coste {0}, {1} expansiones".format(solucion.coste, expansiones))
+    for estrategia in ('lejanos', 'evitar'):
+        problema_rejilla.hitos = Hitos(problema_rejilla, 8, estrategia)
+        print("***** A* CON HITOS '{0}' *****".format(estrategia))
+        print("Hitos: {0}".format(problema_rejilla.hitos))
+        solucion, expansiones = cuenta_expansiones(a_estrella,
+                                                   problema_rejilla)
+        print("Coste {0}, {1} expansiones".format(solucion.coste,
+                                                  expansiones))
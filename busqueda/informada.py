@@ -6,9 +6,17 @@ Diferentes algoritmos de búsqueda informada en grafos.
 Curso del canal de Youtube 'Descubriendo la Inteligencia Artificial'.
 Autor: JL Iglesias Feria (jl.iglesias.feria@gmail.com)
 """
+from heapq import heappush
+from heapq import heapreplace
+from time import perf_counter
+
+from contexto import TIEMPO
+from fronteras import FronteraMinMax
+from fronteras import FronteraPrioridad
 from grafos import Accion
 from grafos import Estado
 from grafos import Nodo
+from grafos import NodoLigero
 from grafos import Problema
 
 
@@ -16,78 +24,307 @@ from grafos import Problema
 def voraz(problema):
     """Búsqueda en grafos voraz (greedy search)."""
     raiz = crea_nodo_raiz(problema)
-    frontera = [raiz, ]
+    frontera = FronteraPrioridad(prioridad('heuristica', problema))
+    frontera.agregar(raiz)
     explorados = set()
+    contexto = problema.contexto
     while True:
         if not frontera:
             return None
-        nodo = sacar_siguiente(frontera, 'heuristica',
-                               objetivos=problema.estados_objetivos)
+        nodo = frontera.sacar()
         if problema.es_objetivo(nodo.estado):
             return nodo
+        if contexto and contexto.agotado(nodo, len(frontera), len(explorados)):
+            return None
         explorados.add(nodo.estado)
-        if not nodo.acciones:
-            continue
-        for nombre_accion in nodo.acciones.keys():
+        for nombre_accion in problema.acciones_estado(nodo.estado):
             accion = Accion(nombre_accion)
             hijo = crea_nodo_hijo(problema, nodo, accion)
-            estados_frontera = [nodo.estado for nodo in frontera]
-            if hijo.estado in explorados or hijo.estado in estados_frontera:
-                buscar = [nodo for nodo in frontera
-                          if nodo.estado == hijo.estado]
-                if buscar:
-                    heuristic_hijo = [hijo.heuristicas[objetivo.nombre]
-                                      for objetivo
-                                      in problema.estados_objetivos]
-                    heuristic_buscar = [buscar[0].heuristicas[objetivo.nombre]
-                                        for objetivo
-                                        in problema.estados_objetivos]
-                    minimo_hijo = min(heuristic_hijo)
-                    minimo_buscar = min(heuristic_buscar)
-                    if minimo_hijo < minimo_buscar:
-                        indice = frontera.index(buscar[0])
-                        frontera[indice] = hijo
+            if hijo.estado in explorados:
+                continue
+            if hijo.estado in frontera:
+                frontera.actualizar(hijo)
             else:
-                frontera.append(hijo)
+                frontera.agregar(hijo)
 
 
 # %%
 def a_estrella(problema):
     """Búsqueda A* (que se lee 'A estrella')."""
     raiz = crea_nodo_raiz(problema)
-    frontera = [raiz, ]
+    frontera = FronteraPrioridad(prioridad('valor', problema))
+    frontera.agregar(raiz)
     explorados = set()
+    contexto = problema.contexto
     while True:
         if not frontera:
             return None
-        nodo = sacar_siguiente(frontera, 'valor',
-                               objetivos=problema.estados_objetivos)
+        nodo = frontera.sacar()
         if problema.es_objetivo(nodo.estado):
             return nodo
+        if contexto and contexto.agotado(nodo, len(frontera), len(explorados)):
+            return None
         explorados.add(nodo.estado)
-        if not nodo.acciones:
-            continue
-        for nombre_accion in nodo.acciones.keys():
+        for nombre_accion in problema.acciones_estado(nodo.estado):
             accion = Accion(nombre_accion)
             hijo = crea_nodo_hijo(problema, nodo, accion)
-            estados_frontera = [nodo.estado for nodo in frontera]
-            if hijo.estado in explorados or hijo.estado in estados_frontera:
-                buscar = [nodo for nodo in frontera
-                          if nodo.estado == hijo.estado]
-                if buscar:
-                    valores_hijo = [hijo.valores[objetivo.nombre]
-                                    for objetivo
-                                    in problema.estados_objetivos]
-                    valores_buscar = [buscar[0].valores[objetivo.nombre]
-                                      for objetivo
-                                      in problema.estados_objetivos]
-                    minimo_hijo = min(valores_hijo)
-                    minimo_buscar = min(valores_buscar)
-                    if minimo_hijo < minimo_buscar:
-                        indice = frontera.index(buscar[0])
-                        frontera[indice] = hijo
+            if hijo.estado in explorados:
+                continue
+            if hijo.estado in frontera:
+                frontera.actualizar(hijo)
             else:
-                frontera.append(hijo)
+                frontera.agregar(hijo)
+
+
+def a_estrella_todos(problema):
+    """Búsqueda A* hasta todos los objetivos en un solo recorrido.
+
+    La heurística es la menor a cualquiera de los objetivos, por lo que sigue
+    siendo admisible para los que faltan y cada objetivo se saca de la
+    frontera con su camino óptimo. Devuelve un diccionario con el nodo del
+    camino de menor coste a cada objetivo alcanzable (sólo los alcanzados
+    si se agota el contexto).
+    """
+    raiz = crea_nodo_raiz(problema)
+    frontera = FronteraPrioridad(prioridad('valor', problema))
+    frontera.agregar(raiz)
+    explorados = set()
+    pendientes = set(problema.estados_objetivos)
+    soluciones = {}
+    contexto = problema.contexto
+    while frontera and pendientes:
+        nodo = frontera.sacar()
+        if nodo.estado in pendientes:
+            soluciones[nodo.estado] = nodo
+            pendientes.discard(nodo.estado)
+        if contexto and contexto.agotado(nodo, len(frontera), len(explorados)):
+            break
+        explorados.add(nodo.estado)
+        for nombre_accion in problema.acciones_estado(nodo.estado):
+            accion = Accion(nombre_accion)
+            hijo = crea_nodo_hijo(problema, nodo, accion)
+            if hijo.estado not in explorados:
+                frontera.mejorar(hijo)
+    return soluciones
+
+
+def a_estrella_compilada(problema):
+    """Búsqueda A* sobre el grafo compilado del problema."""
+    contexto = problema.contexto
+    if contexto:
+        contexto.fase('compilacion')
+    grafo = problema.compilar()
+    origen = grafo.indice(problema.estado_inicial)
+    objetivos = [grafo.indice(objetivo)
+                 for objetivo in problema.estados_objetivos]
+    if contexto:
+        contexto.fase('busqueda')
+    alcanzados, padres, aristas, interrumpido = grafo.buscar(
+        origen, objetivos, grafo.heuristicas.__getitem__, contexto)
+    if interrumpido != -1:
+        contexto.parcial = grafo.reconstruir(problema, interrumpido, padres,
+                                             aristas)
+        return None
+    if not alcanzados:
+        return None
+    objetivo, _ = alcanzados.popitem()
+    return grafo.reconstruir(problema, objetivo, padres, aristas)
+
+
+def ara_estrella(problema, peso=3, decremento=0.5, tiempo=None):
+    """Búsqueda A* en cualquier momento (ARA*, Anytime Repairing A*).
+
+    Empieza como A* con la heurística multiplicada por el peso, que da una
+    solución rápida con un coste como mucho peso veces el óptimo, y después
+    va bajando el peso hasta 1 reutilizando la frontera y los caminos ya
+    encontrados: solo se reabren los estados cerrados cuyo coste ha
+    mejorado (los inconsistentes). Es un generador que devuelve
+    (nodo, cota) cada vez que publica una solución, donde la cota es el
+    máximo de veces que su coste puede superar al óptimo si la heurística
+    es admisible. Solo se publica si mejora la solución o la cota, y la
+    última solución recibida es siempre la mejor:
+        for solucion, cota in ara_estrella(problema, tiempo=0.05):
+            ...
+    Con un tiempo (en segundos) o con el contexto del problema la búsqueda
+    se detiene al agotarlos, también antes de terminar la primera pasada:
+    si ya tiene una solución sin publicar la publica con su cota y
+    termina. El motivo de parada queda en el contexto, y contexto.parcial
+    es en todo momento la mejor solución encontrada (o, si se agota sin
+    ninguna, el nodo que se iba a expandir).
+    """
+    final = None if tiempo is None else perf_counter() + tiempo
+    contexto = problema.contexto
+    raiz = crea_nodo_raiz(problema)
+    alcanzados = {raiz.estado: raiz}
+    inconsistentes = {}
+    frontera = FronteraPrioridad(lambda nodo: nodo.coste + peso *
+                                 problema.heuristica(nodo.estado))
+    frontera.agregar(raiz)
+    mejor = raiz if problema.es_objetivo(raiz.estado) else None
+    if contexto and mejor:
+        contexto.parcial = mejor
+    publicada = None
+    cota_publicada = peso
+    parada = False
+
+    def cota_actual():
+        """Nodos abiertos y cota de la mejor solución respecto al óptimo.
+
+        La cota nunca supera la ya garantizada: el peso si la pasada ha
+        terminado o, si se ha interrumpido, la de la solución publicada.
+        """
+        if not parada:
+            tope = peso
+        elif publicada:
+            tope = cota_publicada
+        else:
+            tope = float('inf')
+        abiertos = list(frontera) + list(inconsistentes.values())
+        cota = 1
+        if abiertos and mejor.coste > 0:
+            inferior = min(nodo.coste + problema.heuristica(nodo.estado)
+                           for nodo in abiertos)
+            cota = tope if inferior <= 0 else min(tope,
+                                                  mejor.coste / inferior)
+            cota = max(1, cota)
+        return abiertos, cota
+
+    while True:
+        if contexto:
+            contexto.fase('peso {0}'.format(peso))
+        explorados = set()
+        while frontera and (not mejor or
+                            frontera.prioridad(mejor) > frontera.minimo()):
+            nodo = frontera.sacar()
+            if final is not None and perf_counter() > final:
+                if contexto and not contexto.motivo:
+                    contexto.motivo = TIEMPO
+                    contexto.parcial = mejor or nodo
+                parada = True
+            elif contexto and contexto.agotado(nodo, len(frontera),
+                                               len(explorados)):
+                if mejor:
+                    contexto.parcial = mejor
+                parada = True
+            if parada:
+                frontera.agregar(nodo)
+                break
+            explorados.add(nodo.estado)
+            for nombre_accion in problema.acciones_estado(nodo.estado):
+                accion = Accion(nombre_accion)
+                hijo = crea_nodo_hijo(problema, nodo, accion)
+                anterior = alcanzados.get(hijo.estado)
+                if anterior and hijo.coste >= anterior.coste:
+                    continue
+                alcanzados[hijo.estado] = hijo
+                if problema.es_objetivo(hijo.estado):
+                    if not mejor or hijo.coste < mejor.coste:
+                        mejor = hijo
+                        if contexto:
+                            contexto.parcial = mejor
+                if hijo.estado in explorados:
+                    inconsistentes[hijo.estado] = hijo
+                else:
+                    frontera.mejorar(hijo)
+        if not mejor:
+            return
+        abiertos, cota = cota_actual()
+        if mejor is not publicada or cota < cota_publicada:
+            publicada, cota_publicada = mejor, cota
+            yield mejor, cota
+        if parada or cota <= 1 or (final is not None and
+                                   perf_counter() > final):
+            return
+        peso = max(1, peso - decremento)
+        frontera = FronteraPrioridad(frontera.prioridad)
+        for nodo in abiertos:
+            frontera.mejorar(nodo)
+        inconsistentes = {}
+
+
+# %%
+def bidireccional_a_estrella(problema):
+    """Búsqueda A* bidireccional (NBA*, New Bidirectional A*).
+
+    Avanza a la vez desde el estado inicial, guiada por la heurística hacia
+    los objetivos, y desde los objetivos con las acciones inversas, guiada
+    por la heurística desde el estado inicial. Cada estado sólo se cierra
+    una vez (por cualquiera de los dos lados) y se descarta sin expandir si
+    su valor, o su coste más el menor valor de la otra frontera menos su
+    heurística contraria, no mejora el mejor camino encontrado. Con
+    heurísticas consistentes devuelve un camino óptimo. Las heurísticas que
+    faltan en la tabla (que valen infinito) se toman como 0, ya que con
+    infinito la poda descartaría caminos mejores.
+    """
+    raiz_i = crea_nodo_raiz(problema)
+    if problema.es_objetivo(raiz_i.estado):
+        return raiz_i
+    infinito = problema.infinito
+
+    def heuristica_i(estado):
+        heuristica = problema.heuristica(estado)
+        return 0 if heuristica >= infinito else heuristica
+
+    def heuristica_f(estado):
+        heuristica = problema.heuristica_inicial(estado)
+        return 0 if heuristica >= infinito else heuristica
+
+    frontera_i = FronteraPrioridad(
+        lambda nodo: nodo.coste + heuristica_i(nodo.estado))
+    frontera_f = FronteraPrioridad(
+        lambda nodo: nodo.coste + heuristica_f(nodo.estado))
+    frontera_i.agregar(raiz_i)
+    alcanzados_i = {raiz_i.estado: raiz_i}
+    alcanzados_f = {}
+    for objetivo in problema.estados_objetivos:
+        raiz_f = crea_nodo_raiz(problema, objetivo)
+        frontera_f.agregar(raiz_f)
+        alcanzados_f[objetivo] = raiz_f
+    cerrados = set()
+    mejor = (None, None)
+    coste_mejor = float('inf')
+    contexto = problema.contexto
+    while frontera_i and frontera_f:
+        if(frontera_i.minimo() >= coste_mejor or
+           frontera_f.minimo() >= coste_mejor):
+            break
+        hacia_delante = len(frontera_i) <= len(frontera_f)
+        if hacia_delante:
+            frontera, otra_frontera = frontera_i, frontera_f
+            alcanzados, otros_alcanzados = alcanzados_i, alcanzados_f
+            heuristica, otra_heuristica = heuristica_i, heuristica_f
+        else:
+            frontera, otra_frontera = frontera_f, frontera_i
+            alcanzados, otros_alcanzados = alcanzados_f, alcanzados_i
+            heuristica, otra_heuristica = heuristica_f, heuristica_i
+        nodo = frontera.sacar()
+        if nodo.estado in cerrados:
+            continue
+        cerrados.add(nodo.estado)
+        if(nodo.coste + heuristica(nodo.estado) >= coste_mejor or
+           nodo.coste + otra_frontera.minimo() -
+           otra_heuristica(nodo.estado) >= coste_mejor):
+            continue
+        if contexto and contexto.agotado():
+            break
+        if hacia_delante:
+            hijos = [crea_nodo_hijo(problema, nodo, Accion(nombre_accion))
+                     for nombre_accion
+                     in problema.acciones_estado(nodo.estado)]
+        else:
+            hijos = [crea_nodo_inverso(problema, nodo, origen,
+                                       Accion(nombre_accion))
+                     for nombre_accion, origen
+                     in problema.predecesores_estado(nodo.estado)]
+        for hijo in hijos:
+            if hijo.estado in cerrados or not frontera.mejorar(hijo):
+                continue
+            alcanzados[hijo.estado] = hijo
+            otro = otros_alcanzados.get(hijo.estado)
+            if otro and hijo.coste + otro.coste < coste_mejor:
+                coste_mejor = hijo.coste + otro.coste
+                mejor = (hijo, otro) if hacia_delante else (otro, hijo)
+    return une_caminos(problema, *mejor)
 
 
 # %%
@@ -101,16 +338,19 @@ def a_estrella_iterativa(problema, nodo=None, limite=0, explorados=None):
         explorados.add(nodo.estado)
     if limite <= 0:
         limite = problema.infinito
-    valor_nodo = min([nodo.valores[objetivo.nombre]
-                      for objetivo in problema.estados_objetivos])
+    valor_nodo = nodo.coste + problema.heuristica(nodo.estado)
     if valor_nodo > limite:
         return None, valor_nodo
     if problema.es_objetivo(nodo.estado):
         return nodo, limite
-    if not nodo.acciones:
+    contexto = problema.contexto
+    if contexto and contexto.agotado(nodo, explorados=len(explorados)):
+        return None, problema.infinito
+    acciones = problema.acciones_estado(nodo.estado)
+    if not acciones:
         return None, limite
     minimo = problema.infinito
-    for nombre_accion in nodo.acciones.keys():
+    for nombre_accion in acciones:
         accion = Accion(nombre_accion)
         hijo = crea_nodo_hijo(problema, nodo, accion)
         if hijo.estado not in explorados:
@@ -127,8 +367,7 @@ def a_estrella_iterativa(problema, nodo=None, limite=0, explorados=None):
 def ida_estrella(problema):
     """Búsqueda IDA* (Iterative Deepening A*)."""
     raiz = crea_nodo_raiz(problema)
-    limite = min([raiz.heuristicas[objetivo.nombre]
-                  for objetivo in problema.estados_objetivos])
+    limite = problema.heuristica(raiz.estado)
     while True:
         explorados = set()
         nodo, limite = a_estrella_iterativa(problema, raiz, limite,
@@ -143,162 +382,375 @@ def ida_estrella(problema):
 def recursiva_primero_mejor(problema):
     """Búsqueda recursiva primero el mejor (Recursive Best-First Search)."""
     raiz = crea_nodo_raiz(problema)
-    raiz.alfa = 0
     limite = problema.infinito
     explorados = set()
-    return _brpm_recursiva(problema, raiz, limite, explorados)
+    alfas = {raiz: 0}
+    sucesores = {}
+    return _brpm_recursiva(problema, raiz, limite, explorados, alfas,
+                           sucesores)
+
 
+def _brpm_recursiva(problema, nodo, limite, explorados, alfas, sucesores):
+    """Función recursiva para búsqueda recursiva primero el mejor.
 
-def _brpm_recursiva(problema, nodo, limite, explorados):
-    """Función recursiva para búsqueda recursiva primero el mejor."""
+    Los valores alfa y los hijos de cada nodo se guardan en los diccionarios
+    alfas y sucesores para poder usar también nodos ligeros.
+    """
     explorados.add(nodo.estado)
     if limite <= 0:
         limite = problema.infinito
     if problema.es_objetivo(nodo.estado):
         return nodo, limite
-    if not nodo.acciones:
+    contexto = problema.contexto
+    if contexto and contexto.agotado(nodo, explorados=len(explorados)):
+        return None, problema.infinito
+    acciones = problema.acciones_estado(nodo.estado)
+    if not acciones:
         return None, limite
-    for nombre_accion in nodo.acciones.keys():
+    hijos = sucesores.setdefault(nodo, [])
+    for nombre_accion in acciones:
         accion = Accion(nombre_accion)
         hijo = crea_nodo_hijo(problema, nodo, accion, False)
         if hijo.estado not in explorados:
             hijo.padre = nodo
-            nodo.hijos.append(hijo)
-            maximo = max([hijo.valores[objetivo.nombre]
-                          for objetivo in problema.estados_objetivos])
-            hijo.alfa = max(maximo, nodo.alfa)
-    if not nodo.hijos:
+            hijos.append(hijo)
+            valor = hijo.coste + problema.heuristica(hijo.estado)
+            alfas[hijo] = max(valor, alfas[nodo])
+    if not hijos:
         return None, problema.infinito
     while True:
-        objetivos = problema.estados_objetivos
-        mejor = nodo.hijo_mejor(problema, metrica='alfa')
-        if mejor.alfa > limite:
-            return None, mejor.alfa
-        hijos = nodo.hijos.copy()
-        nodo.hijos.remove(mejor)
+        mejor = min(hijos, key=alfas.get)
+        if alfas[mejor] > limite:
+            return None, alfas[mejor]
         alfa = limite
-        if nodo.hijos:
-            alternativa = nodo.hijo_mejor(problema, metrica='alfa')
-            alfa = min(limite, alternativa.alfa)
-        nodo.hijos = hijos
-        resultado, mejor.alfa = _brpm_recursiva(problema, mejor, alfa,
-                                                explorados)
+        alternativas = [alfas[hijo] for hijo in hijos if hijo is not mejor]
+        if alternativas:
+            alfa = min(limite, min(alternativas))
+        resultado, alfas[mejor] = _brpm_recursiva(problema, mejor, alfa,
+                                                  explorados, alfas,
+                                                  sucesores)
         if resultado:
-            return resultado, mejor.alfa
+            return resultado, alfas[mejor]
+        if contexto and contexto.motivo:
+            return None, problema.infinito
+
+
+def recursiva_primero_mejor_pila(problema):
+    """Búsqueda recursiva primero el mejor con una pila explícita.
+
+    Da las mismas soluciones que recursiva_primero_mejor sin límite de
+    profundidad por la recursión. Los hijos de cada nodo se guardan en un
+    montículo de entradas [alfa, posición, hijo], de modo que el mejor hijo
+    está en la cima y la mejor alternativa es uno de sus dos hijos en el
+    montículo; al volver de un hijo solo se recoloca su entrada. La
+    posición mantiene el desempate por orden de generación.
+    """
+    infinito = problema.infinito
+    explorados = set()
+    sucesores = {}
+    pila = []
+    contexto = problema.contexto
+    nodo, limite, alfa_nodo = crea_nodo_raiz(problema), infinito, 0
+    while True:
+        resultado = None
+        volviendo = True
+        explorados.add(nodo.estado)
+        if limite <= 0:
+            limite = infinito
+        valor = limite
+        if problema.es_objetivo(nodo.estado):
+            resultado = nodo
+        elif contexto and contexto.agotado(nodo, len(pila), len(explorados)):
+            return None, infinito
+        else:
+            acciones = problema.acciones_estado(nodo.estado)
+            if acciones:
+                hijos = sucesores.setdefault(nodo, [])
+                for nombre_accion in acciones:
+                    accion = Accion(nombre_accion)
+                    hijo = crea_nodo_hijo(problema, nodo, accion, False)
+                    if hijo.estado not in explorados:
+                        hijo.padre = nodo
+                        alfa = hijo.coste + problema.heuristica(hijo.estado)
+                        heappush(hijos, [max(alfa, alfa_nodo), len(hijos),
+                                         hijo])
+                if hijos:
+                    pila.append((hijos, limite))
+                    volviendo = False
+                else:
+                    valor = infinito
+        while pila:
+            hijos, limite = pila[-1]
+            mejor = hijos[0]
+            if volviendo:
+                mejor[0] = valor
+                heapreplace(hijos, mejor)
+                if resultado:
+                    pila.pop()
+                    continue
+                mejor = hijos[0]
+            if mejor[0] > limite:
+                valor = mejor[0]
+                volviendo = True
+                pila.pop()
+                continue
+            alfa = limite
+            if len(hijos) > 1:
+                alternativa = hijos[1][0]
+                if len(hijos) > 2 and hijos[2][0] < alternativa:
+                    alternativa = hijos[2][0]
+                alfa = min(limite, alternativa)
+            alfa_nodo, _, nodo = mejor
+            limite = alfa
+            break
+        else:
+            return resultado, valor
 
 
 # %%
 def sma_estrella(problema, maximo_nodos=10):
-    """Búsqueda A* para memoria limitada (Simplified Memory-Bounded A*)."""
+    """Búsqueda A* para memoria limitada (Simplified Memory-Bounded A*).
+
+    Nunca guarda más de maximo_nodos nodos. Cuando se llena la memoria se
+    olvida la hoja de mayor valor f (la menos profunda si hay empate) y su
+    padre recuerda ese valor, para volver a generarla sólo cuando sea la
+    mejor opción. Cuando un nodo ha generado todos sus sucesores su valor
+    pasa a ser el mejor de los de sus hijos (valores respaldados). Los nodos
+    pendientes están en un montículo min-max, que da el mejor y el peor en
+    O(log n). Con una heurística admisible la solución es óptima si cabe en
+    la memoria (si su profundidad es menor que maximo_nodos).
+    """
+    infinito = float('inf')
     raiz = crea_nodo_raiz(problema)
-    frontera = [raiz, ]
-    explorados = set()
-    while True:
-        if not frontera:
+    valores = {raiz: problema.heuristica(raiz.estado)}
+    profundidades = {raiz: 0}
+    sucesores = {}
+    hijos = {}
+    olvidados = {}
+    indices = {}
+    if maximo_nodos <= 1 and not problema.es_objetivo(raiz.estado):
+        valores[raiz] = infinito
+    frontera = FronteraMinMax(
+        lambda nodo: (valores[nodo], -profundidades[nodo]))
+    frontera.agregar(raiz)
+    en_memoria = 1
+    contexto = problema.contexto
+    while frontera:
+        nodo = frontera.mejor()
+        if valores[nodo] == infinito:
             return None
-        nodo = sacar_siguiente(frontera, 'valor',
-                               objetivos=problema.estados_objetivos)
         if problema.es_objetivo(nodo.estado):
             return nodo
-        explorados.add(nodo.estado)
-        if not nodo.acciones:
+        if contexto and contexto.agotado(nodo, len(frontera), en_memoria):
+            return None
+        if nodo not in sucesores:
+            en_camino = set()
+            antecesor = nodo
+            while antecesor:
+                en_camino.add(antecesor.estado)
+                antecesor = antecesor.padre
+            sucesores[nodo] = [
+                nombre_accion for nombre_accion, destino
+                in problema.acciones_estado(nodo.estado).items()
+                if destino not in en_camino]
+            hijos[nodo] = {}
+            olvidados[nodo] = {}
+        if len(hijos[nodo]) + len(olvidados[nodo]) < len(sucesores[nodo]):
+            indice = len(hijos[nodo]) + len(olvidados[nodo])
+            anterior = 0
+        elif olvidados[nodo]:
+            indice = min(olvidados[nodo], key=olvidados[nodo].get)
+            anterior = olvidados[nodo].pop(indice)
+        else:
+            valores[nodo] = infinito
+            frontera.actualizar(nodo)
+            _sma_respalda(nodo.padre, valores, hijos, olvidados, sucesores,
+                          frontera)
             continue
-        for nombre_accion in nodo.acciones.keys():
-            accion = Accion(nombre_accion)
-            hijo = crea_nodo_hijo(problema, nodo, accion)
-            estados_frontera = [nodo.estado for nodo in frontera]
-            if hijo.estado in explorados or hijo.estado in estados_frontera:
-                buscar = [nodo for nodo in frontera
-                          if nodo.estado == hijo.estado]
-                if buscar:
-                    valores_hijo = [hijo.valores[objetivo.nombre]
-                                    for objetivo
-                                    in problema.estados_objetivos]
-                    valores_buscar = [buscar[0].valores[objetivo.nombre]
-                                      for objetivo
-                                      in problema.estados_objetivos]
-                    minimo_hijo = min(valores_hijo)
-                    minimo_buscar = min(valores_buscar)
-                    if minimo_hijo < minimo_buscar:
-                        indice = frontera.index(buscar[0])
-                        frontera[indice] = hijo
-            else:
-                if len(frontera) > maximo_nodos:
-                    ordenador = lambda x: [x.valores[objetivo.nombre]
-                                           for objetivo
-                                           in problema.estados_objetivos]
-                    frontera = sorted(frontera, key=ordenador)
-                    frontera.pop()
-                frontera.append(hijo)
+        accion = Accion(sucesores[nodo][indice])
+        hijo = crea_nodo_hijo(problema, nodo, accion, agregar=False)
+        hijo.padre = nodo
+        profundidad = profundidades[nodo] + 1
+        if(not problema.es_objetivo(hijo.estado) and
+           profundidad >= maximo_nodos - 1):
+            valor = infinito
+        else:
+            valor = max(valores[nodo],
+                        hijo.coste + problema.heuristica(hijo.estado),
+                        anterior)
+        if en_memoria >= maximo_nodos:
+            peor = _sma_peor_hoja(frontera, nodo, valores, profundidades,
+                                  hijos)
+            if peor is None:
+                olvidados[nodo][indice] = valor
+                continue
+            padre = peor.padre
+            del hijos[padre][indices[peor]]
+            olvidados[padre][indices[peor]] = valores[peor]
+            frontera.quitar(peor)
+            for datos in (valores, profundidades, sucesores, hijos,
+                          olvidados, indices):
+                datos.pop(peor, None)
+            en_memoria -= 1
+            if padre not in frontera:
+                frontera.agregar(padre)
+        valores[hijo] = valor
+        profundidades[hijo] = profundidad
+        indices[hijo] = indice
+        hijos[nodo][indice] = hijo
+        frontera.agregar(hijo)
+        en_memoria += 1
+        if len(hijos[nodo]) == len(sucesores[nodo]):
+            frontera.quitar(nodo)
+        _sma_respalda(nodo, valores, hijos, olvidados, sucesores, frontera)
+    return None
+
+
+def _sma_respalda(nodo, valores, hijos, olvidados, sucesores, frontera):
+    """Actualiza el valor f de los nodos con todos sus sucesores generados.
+
+    El valor respaldado es el menor de los de sus hijos en memoria y de los
+    olvidados. Si cambia se propaga hacia la raíz.
+    """
+    while nodo is not None:
+        if len(hijos[nodo]) + len(olvidados[nodo]) < len(sucesores[nodo]):
+            return
+        valor = min(list(olvidados[nodo].values()) +
+                    [valores[hijo] for hijo in hijos[nodo].values()])
+        if valor == valores[nodo]:
+            return
+        valores[nodo] = valor
+        if nodo in frontera:
+            frontera.actualizar(nodo)
+        nodo = nodo.padre
+
+
+def _sma_peor_hoja(frontera, actual, valores, profundidades, hijos):
+    """Hoja de mayor valor f (la menos profunda si hay empate) a olvidar.
+
+    El peor de la frontera tiene el mayor valor, y sus descendientes en
+    memoria el mismo, así que se baja por ellos hasta una hoja. Nunca
+    devuelve el nodo actual (None si no hay otra hoja).
+    """
+    peor = frontera.peor()
+    while hijos.get(peor):
+        peor = max(hijos[peor].values(),
+                   key=lambda hijo: (valores[hijo], -profundidades[hijo]))
+    if peor is not actual:
+        return peor
+    hojas = [nodo for nodo in frontera
+             if nodo is not actual and not hijos.get(nodo)]
+    if not hojas:
+        return None
+    return max(hojas, key=lambda hoja: (valores[hoja], -profundidades[hoja]))
 
 
 # %%
-def crea_nodo_raiz(problema):
+def crea_nodo_raiz(problema, estado=None):
     """Método auxiliar que ayudará a crear nodos raíz."""
-    estado_raiz = problema.estado_inicial
-    acciones_raiz = {}
-    if estado_raiz.nombre in problema.acciones.keys():
-        acciones_raiz = problema.acciones[estado_raiz.nombre]
+    estado_raiz = estado or problema.estado_inicial
+    if problema.nodos_ligeros:
+        return NodoLigero(estado_raiz)
+    acciones_raiz = problema.acciones_estado(estado_raiz)
     raiz = Nodo(estado_raiz, acciones=acciones_raiz)
     raiz.coste = 0
-    raiz.heuristicas = problema.heuristicas[estado_raiz.nombre]
-    raiz.valores = dict(raiz.heuristicas.items())
+    raiz.evaluar(problema)
     return raiz
 
 
 def crea_nodo_hijo(problema, padre, accion, agregar=True):
     """Creación de nodos hijos."""
     nuevo_estado = problema.resultado(padre.estado, accion)
-    acciones_nuevo = {}
-    if nuevo_estado.nombre in problema.acciones.keys():
-        acciones_nuevo = problema.acciones[nuevo_estado.nombre]
-    hijo = Nodo(nuevo_estado, accion, acciones_nuevo)
+    if problema.contexto:
+        problema.contexto.generar(nuevo_estado)
     coste = padre.coste
     coste += problema.coste_accion(padre.estado, accion)
+    if problema.nodos_ligeros:
+        return NodoLigero(nuevo_estado, padre, accion, coste)
+    acciones_nuevo = problema.acciones_estado(nuevo_estado)
+    hijo = Nodo(nuevo_estado, accion, acciones_nuevo)
     hijo.coste = coste
-    hijo.heuristicas = problema.heuristicas[hijo.estado.nombre]
-    hijo.valores = {estado: heuristica + hijo.coste
-                    for estado, heuristica
-                    in hijo.heuristicas.items()}
+    hijo.evaluar(problema)
     if agregar:
         hijo.padre = padre
         padre.hijos.append(hijo)
     return hijo
 
 
+def crea_nodo_inverso(problema, padre, origen, accion):
+    """Crea el nodo del estado origen desde el que la acción lleva al padre."""
+    if problema.contexto:
+        problema.contexto.generar(origen)
+    coste = padre.coste
+    coste += problema.coste_accion(origen, accion)
+    if problema.nodos_ligeros:
+        return NodoLigero(origen, padre, accion, coste)
+    hijo = Nodo(origen, accion, problema.acciones_estado(origen), padre)
+    hijo.coste = coste
+    hijo.evaluar(problema)
+    padre.hijos.append(hijo)
+    return hijo
+
+
+def une_caminos(problema, nodo_i, nodo_f):
+    """Une los caminos de una búsqueda bidireccional en un solo camino.
+
+    Continúa el camino del nodo_i (desde el estado inicial) con las acciones
+    del camino del nodo_f (hacia el objetivo) y devuelve el nodo objetivo.
+    """
+    if not nodo_i or not nodo_f:
+        return None
+    nodo = nodo_i
+    while nodo_f.padre:
+        nodo = crea_nodo_hijo(problema, nodo, nodo_f.accion)
+        nodo_f = nodo_f.padre
+    return nodo
+
+
+def prioridad(metrica='valor', problema=None):
+    """Devuelve la función que da la prioridad de un nodo según una métrica.
+
+    Las métricas 'valor' (f) y 'heuristica' (h) usan la menor heurística del
+    estado a los objetivos del problema; la métrica 'coste' (g) es el coste
+    del camino. Sirven tanto para nodos normales como para nodos ligeros.
+    """
+    if metrica == 'valor':
+        return lambda nodo: nodo.coste + problema.heuristica(nodo.estado)
+    if metrica == 'heuristica':
+        return lambda nodo: problema.heuristica(nodo.estado)
+    if metrica == 'coste':
+        return lambda nodo: nodo.coste
+    raise ValueError("Métrica desconocida: {0}".format(metrica))
+
+
 def sacar_siguiente(frontera, metrica='valor', criterio='menor',
-                    objetivos=None):
-    """Devuelve el siguiente nodo de la frontera según un criterio."""
+                    objetivos=None, problema=None):
+    """Devuelve el siguiente nodo de la frontera según un criterio.
+
+    Con objetivos se comparan los valores o heurísticas de cada nodo hacia
+    esos objetivos; con problema, la menor heurística a sus objetivos. Sin
+    objetivos la heurística es 0 y el valor es el coste.
+    """
     if not frontera:
         return None
-    mejor = frontera[0]
-    for nodo in frontera[1:]:
-        for objetivo in objetivos:
-            if metrica == 'valor':
-                valor_nodo = nodo.valores[objetivo.nombre]
-                valor_mejor = mejor.valores[objetivo.nombre]
-                if(criterio == 'menor' and
-                   valor_nodo < valor_mejor):
-                    mejor = nodo
-                elif(criterio == 'mayor' and
-                     valor_nodo > valor_mejor):
-                    mejor = nodo
-            elif metrica == 'heuristica':
-                heuristica_nodo = nodo.heuristicas[objetivo.nombre]
-                heuristica_mejor = mejor.heuristicas[objetivo.nombre]
-                if(criterio == 'menor' and
-                   heuristica_nodo < heuristica_mejor):
-                    mejor = nodo
-                elif(criterio == 'mayor' and
-                     heuristica_nodo > heuristica_mejor):
-                    mejor = nodo
-            elif metrica == 'coste':
-                if(criterio == 'menor' and
-                   nodo.coste_camino < mejor.coste_camino):
-                    mejor = nodo
-                elif(criterio == 'mayor' and
-                     nodo.coste_camino > mejor.coste_camino):
-                    mejor = nodo
+    if objetivos is not None and metrica != 'coste':
+        nombres = [objetivo.nombre for objetivo in objetivos]
+        if metrica == 'valor':
+            def clave(nodo):
+                return min((nodo.valores[nombre] for nombre in nombres),
+                           default=nodo.coste)
+        elif metrica == 'heuristica':
+            def clave(nodo):
+                return min((nodo.heuristicas[nombre] for nombre in nombres),
+                           default=0)
+        else:
+            raise ValueError("Métrica desconocida: {0}".format(metrica))
+    else:
+        clave = prioridad(metrica, problema)
+    if criterio == 'mayor':
+        mejor = max(frontera, key=clave)
+    else:
+        mejor = min(frontera, key=clave)
     frontera.remove(mejor)
     return mejor
 
@@ -312,19 +764,13 @@ def muestra_solucion(objetivo=None):
     while nodo:
         msg = "Estado {0}, Valor {1}"
         estado = nodo.estado.nombre
-        valores = [nodo.valores[objetivo.nombre]
-                   for objetivo
-                   in problema_resolver.estados_objetivos]
-        valor = min(valores)
+        heuristica = problema_resolver.heuristica(nodo.estado)
+        valor = nodo.coste + heuristica
         print(msg.format(estado, valor))
         msg = "  Coste: {0}"
         coste_total = nodo.coste
         print(msg.format(coste_total))
         msg = "  Heurística: {0}"
-        heuristicas_objetivos = [nodo.heuristicas[objetivo.nombre]
-                                 for objetivo
-                                 in problema_resolver.estados_objetivos]
-        heuristica = min(heuristicas_objetivos)
         print(msg.format(heuristica))
         if nodo.accion:
             accion = nodo.accion.nombre
@@ -338,6 +784,9 @@ def muestra_solucion(objetivo=None):
 
 # %%
 if __name__ == '__main__':
+    from noinformada import coste_uniforme
+    from rendimiento import cuenta_expansiones
+
     accN = Accion('N')
     accS = Accion('S')
     accE = Accion('E')
@@ -836,10 +1285,17 @@ if __name__ == '__main__':
     objetivo_3 = [boomon, goorum]
     problema_3 = Problema(lanoi, objetivo_3, acciones, costes, heuristicas)
 
+    problemas_sin_heuristicas = [Problema(lanoi, [objetivo], acciones, costes)
+                                 for objetivo in (shiphos, kosos)]
+
     LANZA_VORAZ = True
     LANZA_A_ESTRELLA = True
+    LANZA_A_ESTRELLA_COMPILADA = True
+    LANZA_ARA_ESTRELLA = True
+    LANZA_BIDIRECCIONAL_A_ESTRELLA = True
     LANZA_IDA_ESTRELLA = True
     LANZA_RECURSIVA_PRIMER_MEJOR = True
+    LANZA_RECURSIVA_PRIMER_MEJOR_PILA = True
     LANZA_SMA_ESTRELLA = True
 
     problema_resolver = problema_1
@@ -854,6 +1310,45 @@ if __name__ == '__main__':
         solucion = a_estrella(problema_resolver)
         muestra_solucion(solucion)
 
+    if LANZA_A_ESTRELLA_COMPILADA:
+        print("***** A* (GRAFO COMPILADO) *****")
+        solucion = a_estrella_compilada(problema_resolver)
+        muestra_solucion(solucion)
+
+    if LANZA_ARA_ESTRELLA:
+        print("***** ARA* *****")
+        for solucion, cota in ara_estrella(problema_resolver):
+            print("Coste {0}, cota {1:.2f}".format(solucion.coste, cota))
+        muestra_solucion(solucion)
+        print("Sin heurísticas, coste uniforme frente a ARA*:")
+        for problema in problemas_sin_heuristicas:
+            sol_u = coste_uniforme(problema)
+            for sol_a, cota in ara_estrella(problema):
+                pass
+            msg = "  {0}: coste {1} y {2} (cota {3:.2f})"
+            print(msg.format(problema.estados_objetivos[0], sol_u.coste,
+                             sol_a.coste, cota))
+
+    if LANZA_BIDIRECCIONAL_A_ESTRELLA:
+        print("***** A* BIDIRECCIONAL (NBA*) *****")
+        solucion = bidireccional_a_estrella(problema_resolver)
+        muestra_solucion(solucion)
+        print("Expansiones A* frente a NBA*:")
+        for nombre, problema in (('problema_1', problema_1),
+                                 ('problema_2', problema_2),
+                                 ('problema_3', problema_3)):
+            sol_a, exp_a = cuenta_expansiones(a_estrella, problema)
+            sol_b, exp_b = cuenta_expansiones(bidireccional_a_estrella,
+                                              problema)
+            msg = "  {0}: A* {1} (coste {2}), NBA* {3} (coste {4})"
+            print(msg.format(nombre, exp_a, sol_a.coste, exp_b, sol_b.coste))
+        print("Sin heurísticas, coste uniforme frente a NBA*:")
+        for problema in problemas_sin_heuristicas:
+            sol_u = coste_uniforme(problema)
+            sol_b = bidireccional_a_estrella(problema)
+            print("  {0}: coste {1} y {2}".format(
+                problema.estados_objetivos[0], sol_u.coste, sol_b.coste))
+
     if LANZA_IDA_ESTRELLA:
         print("***** IDA* *****")
         solucion = ida_estrella(problema_resolver)
@@ -864,7 +1359,12 @@ if __name__ == '__main__':
         solucion, _ = recursiva_primero_mejor(problema_resolver)
         muestra_solucion(solucion)
 
+    if LANZA_RECURSIVA_PRIMER_MEJOR_PILA:
+        print("***** RECURSIVA PRIMERO MEJOR (PILA) *****")
+        solucion, _ = recursiva_primero_mejor_pila(problema_resolver)
+        muestra_solucion(solucion)
+
     if LANZA_SMA_ESTRELLA:
         print("***** SMA* *****")
-        solucion = sma_estrella(problema_resolver, maximo_nodos=1)
+        solucion = sma_estrella(problema_resolver, maximo_nodos=12)
         muestra_solucion(solucion,)
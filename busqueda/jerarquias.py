@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Jerarquías de contracciones para caminos mínimos en grafos estáticos.
+
+Curso del canal de Youtube 'Descubriendo la Inteligencia Artificial'.
+Autor: JL Iglesias Feria (jl.iglesias.feria@gmail.com)
+"""
+import json
+from heapq import heapify
+from heapq import heappop
+from heapq import heappush
+
+
+# %%
+class JerarquiaContracciones:
+    """Jerarquía de contracciones (Contraction Hierarchies) de un problema.
+
+    El preproceso contrae los estados de uno en uno, de menos a más
+    importante, añadiendo atajos entre sus vecinos cuando no hay otro camino
+    igual de barato (camino testigo). Después, cada consulta es una búsqueda
+    bidireccional que sólo sube de nivel, por lo que explora muy pocos
+    estados. Los atajos recuerdan el estado contraído para poder desplegar
+    el camino original.
+    """
+
+    def __init__(self, problema=None, limite_testigo=50, saltos_testigo=5,
+                 limite_estimacion=10, saltos_estimacion=2):
+        self.problema = problema
+        self.limite_testigo = limite_testigo
+        self.saltos_testigo = saltos_testigo
+        self.limite_estimacion = limite_estimacion
+        self.saltos_estimacion = saltos_estimacion
+        self.grafo = None
+        self.niveles = []
+        self.subidas = []
+        self.bajadas = []
+        self.intermedios = {}
+        self.originales = {}
+        if problema is not None:
+            self.grafo = problema.compilar()
+            self.__preprocesar()
+
+    def __str__(self):
+        """Representación en modo texto de la jerarquía."""
+        msg = "{0} estados, {1} atajos"
+        return msg.format(len(self.niveles), len(self.intermedios))
+
+    def __repr__(self):
+        """Representación de la jerarquía para depuración."""
+        return "JerarquiaContracciones({0})".format(self)
+
+    def coste(self, origen, destino):
+        """Devuelve el coste mínimo del origen al destino (None si no hay)."""
+        coste, _ = self.__consulta(self.grafo.indice(origen),
+                                   self.grafo.indice(destino))
+        return coste
+
+    def camino(self, origen, destino):
+        """Devuelve el nodo destino del camino mínimo desde el origen."""
+        indice_origen = self.grafo.indice(origen)
+        coste, atajos = self.__consulta(indice_origen,
+                                        self.grafo.indice(destino))
+        if coste is None:
+            return None
+        aristas = []
+        for atajo in atajos:
+            aristas.extend(self.__despliega(*atajo))
+        return self.grafo.nodos_camino(self.problema, indice_origen, aristas)
+
+    def guardar(self, ruta):
+        """Guarda la jerarquía en un fichero JSON."""
+        datos = {'estados': [estado.nombre for estado in self.grafo.estados],
+                 'niveles': self.niveles,
+                 'subidas': self.subidas,
+                 'bajadas': self.bajadas,
+                 'intermedios': [[u, w, v] for (u, w), v
+                                 in self.intermedios.items()],
+                 'originales': [[u, w, arista] for (u, w), arista
+                                in self.originales.items()]}
+        with open(ruta, 'w', encoding='utf-8') as fichero:
+            json.dump(datos, fichero)
+
+    @classmethod
+    def cargar(cls, ruta, problema):
+        """Carga del fichero JSON la jerarquía preprocesada del problema."""
+        with open(ruta, encoding='utf-8') as fichero:
+            datos = json.load(fichero)
+        jerarquia = cls()
+        jerarquia.problema = problema
+        jerarquia.grafo = problema.compilar()
+        nombres = [estado.nombre for estado in jerarquia.grafo.estados]
+        if nombres != datos['estados']:
+            raise ValueError("La jerarquía no corresponde a este problema")
+        jerarquia.niveles = datos['niveles']
+        jerarquia.subidas = [[tuple(arista) for arista in aristas]
+                             for aristas in datos['subidas']]
+        jerarquia.bajadas = [[tuple(arista) for arista in aristas]
+                             for aristas in datos['bajadas']]
+        jerarquia.intermedios = {(u, w): v
+                                 for u, w, v in datos['intermedios']}
+        jerarquia.originales = {(u, w): arista
+                                for u, w, arista in datos['originales']}
+        return jerarquia
+
+    def __preprocesar(self):
+        """Contrae todos los estados y construye los grafos de subida."""
+        grafo = self.grafo
+        total = len(grafo.estados)
+        salidas = [{} for _ in range(total)]
+        entradas = [{} for _ in range(total)]
+        for origen in range(total):
+            for arista in range(grafo.inicios[origen],
+                                grafo.inicios[origen + 1]):
+                destino = grafo.destinos[arista]
+                coste = grafo.costes[arista]
+                if destino == origen:
+                    continue
+                if coste < salidas[origen].get(destino, float('inf')):
+                    salidas[origen][destino] = coste
+                    entradas[destino][origen] = coste
+                    self.originales[(origen, destino)] = arista
+        self.niveles = [0] * total
+        self.subidas = [[] for _ in range(total)]
+        self.bajadas = [[] for _ in range(total)]
+        contraidos = [0] * total
+        profundidades = [0] * total
+        cola = []
+        for estado in range(total):
+            cola.append((self.__importancia(estado, salidas, entradas,
+                                            contraidos, profundidades),
+                         estado))
+        heapify(cola)
+        nivel = 0
+        while cola:
+            _, estado = heappop(cola)
+            importancia = self.__importancia(estado, salidas, entradas,
+                                             contraidos, profundidades)
+            if cola and importancia > cola[0][0]:
+                heappush(cola, (importancia, estado))
+                continue
+            atajos = self.__atajos(estado, salidas, entradas,
+                                   self.limite_testigo, self.saltos_testigo)
+            self.niveles[estado] = nivel
+            nivel += 1
+            self.subidas[estado] = list(salidas[estado].items())
+            self.bajadas[estado] = list(entradas[estado].items())
+            vecinos = set(salidas[estado]) | set(entradas[estado])
+            for destino in salidas[estado]:
+                del entradas[destino][estado]
+            for origen in entradas[estado]:
+                del salidas[origen][estado]
+            for vecino in vecinos:
+                contraidos[vecino] += 1
+                profundidades[vecino] = max(profundidades[vecino],
+                                            profundidades[estado] + 1)
+            salidas[estado] = {}
+            entradas[estado] = {}
+            for origen, destino, coste in atajos:
+                if coste < salidas[origen].get(destino, float('inf')):
+                    salidas[origen][destino] = coste
+                    entradas[destino][origen] = coste
+                    self.intermedios[(origen, destino)] = estado
+
+    def __importancia(self, estado, salidas, entradas, contraidos,
+                      profundidades):
+        """Orden de contracción: se contraen antes los de menor importancia.
+
+        Suma la diferencia de aristas (estimada con búsquedas de testigos más
+        cortas que las de la contracción), los vecinos ya contraídos y la
+        profundidad del estado en la jerarquía.
+        """
+        atajos = self.__atajos(estado, salidas, entradas,
+                               self.limite_estimacion, self.saltos_estimacion)
+        diferencia = len(atajos) - len(salidas[estado]) - len(entradas[estado])
+        return 2 * diferencia + contraidos[estado] + profundidades[estado]
+
+    def __atajos(self, estado, salidas, entradas, asentados, saltos):
+        """Atajos necesarios para contraer el estado indicado."""
+        atajos = []
+        infinito = float('inf')
+        for origen, coste_entrada in entradas[estado].items():
+            directas = salidas[origen]
+            objetivos = {destino: coste_entrada + coste_salida
+                         for destino, coste_salida in salidas[estado].items()
+                         if destino != origen and
+                         directas.get(destino, infinito) >
+                         coste_entrada + coste_salida}
+            if not objetivos:
+                continue
+            distancias = self.__testigos(origen, estado, objetivos,
+                                         max(objetivos.values()), salidas,
+                                         asentados, saltos)
+            for destino, coste in objetivos.items():
+                if distancias.get(destino, infinito) > coste:
+                    atajos.append((origen, destino, coste))
+        return atajos
+
+    def __testigos(self, origen, excluido, objetivos, limite, salidas,
+                   maximo_asentados, maximo_saltos):
+        """Búsqueda limitada de caminos que no pasan por el excluido.
+
+        No sigue caminos que superen el coste límite o tengan más de
+        maximo_saltos aristas, y se detiene tras asentar maximo_asentados
+        estados: si no encuentra un testigo se añade un atajo, que sobra
+        pero nunca da caminos incorrectos.
+        """
+        distancias = {origen: 0}
+        frontera = [(0, 0, origen)]
+        pendientes = set(objetivos)
+        asentados = 0
+        infinito = float('inf')
+        while frontera and pendientes and asentados < maximo_asentados:
+            distancia, saltos, actual = heappop(frontera)
+            if distancia > distancias[actual]:
+                continue
+            pendientes.discard(actual)
+            asentados += 1
+            if saltos >= maximo_saltos:
+                continue
+            saltos += 1
+            for destino, coste in salidas[actual].items():
+                nueva = distancia + coste
+                if(nueva <= limite and destino != excluido and
+                   nueva < distancias.get(destino, infinito)):
+                    distancias[destino] = nueva
+                    heappush(frontera, (nueva, saltos, destino))
+        return distancias
+
+    def __consulta(self, origen, destino):
+        """Búsqueda bidireccional hacia arriba en la jerarquía.
+
+        Un estado al que se llega más barato bajando desde otro ya alcanzado
+        no puede estar en el camino mínimo, así que no se expande (stall on
+        demand). Devuelve el coste y la lista de aristas de la jerarquía (que
+        pueden ser atajos) del camino mínimo, o (None, None) si no hay camino.
+        """
+        if origen == destino:
+            return 0, []
+        infinito = float('inf')
+        distancias = ({origen: 0}, {destino: 0})
+        padres = ({origen: -1}, {destino: -1})
+        fronteras = ([(0, origen)], [(0, destino)])
+        aristas = (self.subidas, self.bajadas)
+        inversas = (self.bajadas, self.subidas)
+        mejor = infinito
+        encuentro = -1
+        lado = 0
+        while True:
+            frontera = fronteras[lado]
+            if not frontera or frontera[0][0] >= mejor:
+                lado = 1 - lado
+                frontera = fronteras[lado]
+                if not frontera or frontera[0][0] >= mejor:
+                    break
+            distancia, actual = heappop(frontera)
+            propias = distancias[lado]
+            if distancia <= propias[actual]:
+                otra = distancias[1 - lado].get(actual)
+                if otra is not None and distancia + otra < mejor:
+                    mejor = distancia + otra
+                    encuentro = actual
+                for superior, coste in inversas[lado][actual]:
+                    if propias.get(superior, infinito) + coste < distancia:
+                        break
+                else:
+                    for vecino, coste in aristas[lado][actual]:
+                        nueva = distancia + coste
+                        if nueva < propias.get(vecino, infinito):
+                            propias[vecino] = nueva
+                            padres[lado][vecino] = actual
+                            heappush(frontera, (nueva, vecino))
+            lado = 1 - lado
+        if encuentro == -1:
+            return None, None
+        atajos = []
+        actual = encuentro
+        while padres[0][actual] != -1:
+            atajos.append((padres[0][actual], actual))
+            actual = padres[0][actual]
+        atajos.reverse()
+        actual = encuentro
+        while padres[1][actual] != -1:
+            atajos.append((actual, padres[1][actual]))
+            actual = padres[1][actual]
+        return mejor, atajos
+
+    def __despliega(self, origen, destino):
+        """Devuelve las aristas originales que forman una arista o atajo."""
+        aristas = []
+        pendientes = [(origen, destino)]
+        while pendientes:
+            origen, destino = pendientes.pop()
+            intermedio = self.intermedios.get((origen, destino))
+            if intermedio is None:
+                aristas.append(self.originales[(origen, destino)])
+            else:
+                pendientes.append((intermedio, destino))
+                pendientes.append((origen, intermedio))
+        return aristas
+
+
+# %%
+if __name__ == '__main__':
+    import os
+    import tempfile
+    import time
+    from random import Random
+
+    from grafos import Estado
+    from grafos import Problema
+    from noinformada import coste_uniforme
+
+    ESTADOS = 2000
+    CONSULTAS = 200
+    aleatorio = Random(0)
+    posiciones = [(aleatorio.random(), aleatorio.random())
+                  for _ in range(ESTADOS)]
+    estados = [Estado("C{0}".format(indice), []) for indice in range(ESTADOS)]
+    acciones = {estado.nombre: {} for estado in estados}
+    costes = {estado.nombre: {} for estado in estados}
+    celdas = {}
+    for indice, (x, y) in enumerate(posiciones):
+        celdas.setdefault((int(x * 30), int(y * 30)), []).append(indice)
+    for indice, (x, y) in enumerate(posiciones):
+        for d_x in (-1, 0, 1):
+            for d_y in (-1, 0, 1):
+                celda = (int(x * 30) + d_x, int(y * 30) + d_y)
+                for vecino in celdas.get(celda, []):
+                    v_x, v_y = posiciones[vecino]
+                    distancia = ((x - v_x) ** 2 + (y - v_y) ** 2) ** 0.5
+                    if vecino != indice and distancia < 0.04:
+                        nombre = "a {0}".format(estados[vecino].nombre)
+                        acciones[estados[indice].nombre][nombre] = \
+                            estados[vecino]
+                        costes[estados[indice].nombre][nombre] = \
+                            int(distancia * 10000) + 1
+    problema_red = Problema(estados[0], [estados[1]], acciones, costes)
+
+    print("***** PREPROCESO *****")
+    inicio = time.perf_counter()
+    jerarquia = JerarquiaContracciones(problema_red)
+    print("{0} en {1:.1f} s".format(jerarquia, time.perf_counter() - inicio))
+    ruta = os.path.join(tempfile.gettempdir(), 'jerarquia.json')
+    jerarquia.guardar(ruta)
+    jerarquia = JerarquiaContracciones.cargar(ruta, problema_red)
+
+    print("***** CONSULTAS *****")
+    pares = [(aleatorio.choice(estados), aleatorio.choice(estados))
+             for _ in range(CONSULTAS)]
+    iguales = 0
+    tiempo_coste = 0
+    tiempo_camino = 0
+    tiempo_coste_uniforme = 0
+    for origen, destino in pares:
+        inicio = time.perf_counter()
+        jerarquia.coste(origen, destino)
+        tiempo_coste += time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        nodo = jerarquia.camino(origen, destino)
+        tiempo_camino += time.perf_counter() - inicio
+        problema_red.estado_inicial = origen
+        problema_red.estados_objetivos = [destino]
+        inicio = time.perf_counter()
+        referencia = coste_uniforme(problema_red)
+        tiempo_coste_uniforme += time.perf_counter() - inicio
+        coste = nodo.coste if nodo else None
+        if coste == (referencia.coste if referencia else None):
+            iguales += 1
+    print("Iguales a coste uniforme: {0} de {1}".format(iguales, CONSULTAS))
+    msg = ("Tiempo medio: jerarquía {0:.0f} us (coste) y {1:.0f} us (camino), "
+           "coste uniforme {2:.0f} us")
+    print(msg.format(tiempo_coste / CONSULTAS * 1e6,
+                     tiempo_camino / CONSULTAS * 1e6,
+                     tiempo_coste_uniforme / CONSULTAS * 1e6))
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resolución de lotes de consultas de caminos sobre un mismo problema.
+
+Curso del canal de Youtube 'Descubriendo la Inteligencia Artificial'.
+Autor: JL Iglesias Feria (jl.iglesias.feria@gmail.com)
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+
+from grafos import Estado
+from grafos import Problema
+
+
+# Grafo compilado y heurísticas de cada proceso trabajador (sólo se usan en
+# los procesos del ProcessPoolExecutor).
+_grafo = None
+_heuristicas = None
+
+
+# %%
+def resolver_lote(problema, pares, algoritmo='coste_uniforme', workers=None):
+    """Resuelve muchas parejas (origen, destino) sobre el mismo problema.
+
+    Las parejas con el mismo origen se resuelven con una sola búsqueda hasta
+    todos sus destinos sobre el grafo compilado del problema. Con workers
+    mayor que 1 las búsquedas se reparten entre procesos, que reciben el
+    grafo compilado una sola vez al arrancar. Es un generador que devuelve
+    (origen, destino, nodo) según va terminando cada búsqueda; el nodo es
+    None si el destino no es alcanzable.
+    El algoritmo puede ser 'coste_uniforme' o 'a_estrella'.
+    """
+    if algoritmo not in ('coste_uniforme', 'a_estrella'):
+        raise ValueError("Algoritmo desconocido: {0}".format(algoritmo))
+    grafo = problema.compilar()
+    heuristicas = None
+    if algoritmo == 'a_estrella':
+        heuristicas = problema.hitos or problema.heuristicas
+    grupos = {}
+    for origen, destino in pares:
+        destinos = grupos.setdefault(grafo.indice(origen), [])
+        destinos.append(grafo.indice(destino))
+    if not workers or workers <= 1:
+        for origen, destinos in grupos.items():
+            caminos = caminos_minimos(grafo, origen, destinos, heuristicas)
+            yield from _nodos_grupo(problema, grafo, origen, destinos,
+                                    caminos)
+        return
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_inicia_trabajador,
+                             initargs=(grafo, heuristicas)) as ejecutor:
+        futuros = {ejecutor.submit(_resuelve_grupo, origen, destinos):
+                   (origen, destinos)
+                   for origen, destinos in grupos.items()}
+        for futuro in as_completed(futuros):
+            origen, destinos = futuros[futuro]
+            yield from _nodos_grupo(problema, grafo, origen, destinos,
+                                    futuro.result())
+
+
+def caminos_minimos(grafo, origen, destinos, heuristicas=None):
+    """Caminos de menor coste desde un origen a varios destinos a la vez.
+
+    Es una búsqueda de coste uniforme (o A* si se indican las heurísticas,
+    como diccionario {estado: {objetivo: heurística}}, como función
+    heuristicas(estado, objetivo) o como Hitos) sobre los arrays del
+    grafo compilado, que se detiene al alcanzar todos los destinos. Devuelve
+    un diccionario {destino: (coste, aristas)} con los destinos alcanzables.
+    """
+    heuristica = _heuristica_grupo(grafo, destinos, heuristicas)
+    alcanzados, padres, aristas, _ = grafo.buscar(origen, destinos,
+                                                  heuristica, todos=True)
+    return {destino: (coste, grafo.camino(destino, padres, aristas)[1])
+            for destino, coste in alcanzados.items()}
+
+
+def _heuristica_grupo(grafo, destinos, heuristicas):
+    """Menor heurística de cada estado a los destinos.
+
+    Devuelve None si no hay heurísticas.
+    """
+    if not heuristicas:
+        return None
+    nombres = [grafo.estados[destino].nombre for destino in destinos]
+    cache = {}
+
+    def heuristica(indice):
+        if indice not in cache:
+            if hasattr(heuristicas, 'estimar'):
+                cache[indice] = min(heuristicas.estimar(indice, destino)
+                                    for destino in destinos)
+            elif callable(heuristicas):
+                cache[indice] = min(heuristicas(grafo.estados[indice],
+                                                grafo.estados[destino])
+                                    for destino in destinos)
+            else:
+                heuristicas_estado = heuristicas.get(
+                    grafo.estados[indice].nombre, {})
+                cache[indice] = min(heuristicas_estado.get(nombre, 0)
+                                    for nombre in nombres)
+        return cache[indice]
+
+    return heuristica
+
+
+def _inicia_trabajador(grafo, heuristicas):
+    """Guarda el grafo y las heurísticas compartidas por las búsquedas."""
+    global _grafo, _heuristicas
+    _grafo = grafo
+    _heuristicas = heuristicas
+
+
+def _resuelve_grupo(origen, destinos):
+    """Resuelve en el proceso trabajador las consultas de un mismo origen."""
+    return caminos_minimos(_grafo, origen, destinos, _heuristicas)
+
+
+def _nodos_grupo(problema, grafo, origen, destinos, caminos):
+    """Genera los resultados de un grupo creando los nodos de cada camino."""
+    for destino in destinos:
+        nodo = None
+        if destino in caminos:
+            nodo = grafo.nodos_camino(problema, origen, caminos[destino][1])
+        yield grafo.estados[origen], grafo.estados[destino], nodo
+
+
+# %%
+if __name__ == '__main__':
+    from random import Random
+
+    LADO = 40
+    CONSULTAS = 200
+    estados = {}
+    for fila in range(LADO):
+        for columna in range(LADO):
+            nombre = "{0},{1}".format(fila, columna)
+            estados[(fila, columna)] = Estado(nombre, [])
+    acciones = {}
+    costes = {}
+    for (fila, columna), estado in estados.items():
+        acciones[estado.nombre] = {}
+        costes[estado.nombre] = {}
+        for nombre, vecino in (('N', (fila - 1, columna)),
+                               ('S', (fila + 1, columna)),
+                               ('E', (fila, columna + 1)),
+                               ('O', (fila, columna - 1))):
+            if vecino in estados:
+                acciones[estado.nombre][nombre] = estados[vecino]
+                costes[estado.nombre][nombre] = 1 + (fila + columna) % 5
+    lista = list(estados.values())
+    problema_lote = Problema(lista[0], [lista[-1]], acciones, costes)
+    aleatorio = Random(0)
+    origenes = aleatorio.sample(lista, 10)
+    consultas = [(aleatorio.choice(origenes), aleatorio.choice(lista))
+                 for _ in range(CONSULTAS)]
+
+    print("***** LOTE DE {0} CONSULTAS (4 PROCESOS) *****".format(CONSULTAS))
+    total = 0
+    for origen, destino, nodo in resolver_lote(problema_lote, consultas,
+                                               workers=4):
+        total += nodo.coste
+    print("Suma de los costes: {0}".format(total))
+    print("***** LOTE DE {0} CONSULTAS (SIN PROCESOS) *****".format(CONSULTAS))
+    total = sum(nodo.coste
+                for _, _, nodo in resolver_lote(problema_lote, consultas))
+    print("Suma de los costes: {0}".format(total))
@@ -6,10 +6,18 @@ Diferentes algoritmos de búsqueda no informada en grafos.
 Curso del canal de Youtube 'Descubriendo la Inteligencia Artificial'.
 Autor: JL Iglesias Feria (jl.iglesias.feria@gmail.com)
 """
+from array import array
+from collections import deque
+
+from fronteras import FronteraCola
+from fronteras import FronteraPila
+from fronteras import FronteraPrioridad
 from grafos import Accion
 from grafos import Estado
 from grafos import Nodo
+from grafos import NodoLigero
 from grafos import Problema
+from grafos import ProblemaImplicito
 
 
 # %%
@@ -18,57 +26,151 @@ def anchura(problema):
     raiz = crea_nodo_raiz(problema)
     if problema.es_objetivo(raiz.estado):
         return raiz
-    frontera = [raiz, ]
+    frontera = FronteraCola()
+    frontera.agregar(raiz)
     explorados = set()
+    contexto = problema.contexto
     while True:
         if not frontera:
             return None
-        nodo = frontera.pop(0)
+        nodo = frontera.sacar()
+        if contexto and contexto.agotado(nodo, len(frontera), len(explorados)):
+            return None
         explorados.add(nodo.estado)
-        if not nodo.acciones:
-            continue
-        for nombre_accion in nodo.acciones.keys():
+        for nombre_accion in problema.acciones_estado(nodo.estado):
             accion = Accion(nombre_accion)
             hijo = crea_nodo_hijo(problema, nodo, accion)
-            estados_frontera = [nodo.estado for nodo in frontera]
             if(hijo.estado not in explorados and
-               hijo.estado not in estados_frontera):
+               hijo.estado not in frontera):
                 es_objetivo = problema.es_objetivo(hijo.estado)
                 if es_objetivo:
                     return hijo
-                frontera.append(hijo)
+                frontera.agregar(hijo)
 
 
 # %%
 def coste_uniforme(problema):
     """Búsqueda en grafos de coste uniforme (uniform-cost search)."""
     raiz = crea_nodo_raiz(problema)
-    frontera = [raiz, ]
+    frontera = FronteraPrioridad(lambda nodo: nodo.coste)
+    frontera.agregar(raiz)
     explorados = set()
+    contexto = problema.contexto
     while True:
         if not frontera:
             return None
-        nodo = frontera.pop(0)
+        nodo = frontera.sacar()
         if problema.es_objetivo(nodo.estado):
             return nodo
+        if contexto and contexto.agotado(nodo, len(frontera), len(explorados)):
+            return None
         explorados.add(nodo.estado)
-        if not nodo.acciones:
-            continue
-        for nombre_accion in nodo.acciones.keys():
+        for nombre_accion in problema.acciones_estado(nodo.estado):
             accion = Accion(nombre_accion)
             hijo = crea_nodo_hijo(problema, nodo, accion)
-            estados_frontera = [nodo.estado for nodo in frontera]
-            if(hijo.estado not in explorados and
-               hijo.estado not in estados_frontera):
-                frontera.append(hijo)
+            if hijo.estado in explorados:
+                continue
+            if hijo.estado not in frontera:
+                frontera.agregar(hijo)
             else:
-                buscar = [nodo for nodo in frontera
-                          if nodo.estado == hijo.estado]
-                if buscar:
-                    if hijo.coste < buscar[0].coste:
-                        indice = frontera.index(buscar[0])
-                        frontera[indice] = hijo
-            frontera.sort(key=lambda nodo: nodo.coste)
+                frontera.actualizar(hijo)
+
+
+# %%
+def anchura_compilada(problema):
+    """Búsqueda primero en anchura sobre el grafo compilado del problema."""
+    contexto = problema.contexto
+    if contexto:
+        contexto.fase('compilacion')
+    grafo = problema.compilar()
+    origen = grafo.indice(problema.estado_inicial)
+    objetivos = set(grafo.indice(objetivo)
+                    for objetivo in problema.estados_objetivos)
+    total = len(grafo.estados)
+    padres = array('l', [-1]) * total
+    aristas = array('l', [-1]) * total
+    if origen in objetivos:
+        return grafo.reconstruir(problema, origen, padres, aristas)
+    alcanzados = bytearray(total)
+    alcanzados[origen] = 1
+    inicios = grafo.inicios
+    destinos = grafo.destinos
+    if contexto:
+        contexto.fase('busqueda')
+    frontera = deque([origen])
+    while frontera:
+        actual = frontera.popleft()
+        if contexto and contexto.agotado(
+                actual, len(frontera),
+                generados=inicios[actual + 1] - inicios[actual]):
+            contexto.parcial = grafo.reconstruir(problema, actual, padres,
+                                                 aristas)
+            return None
+        for arista in range(inicios[actual], inicios[actual + 1]):
+            destino = destinos[arista]
+            if alcanzados[destino]:
+                continue
+            alcanzados[destino] = 1
+            padres[destino] = actual
+            aristas[destino] = arista
+            if destino in objetivos:
+                return grafo.reconstruir(problema, destino, padres, aristas)
+            frontera.append(destino)
+    return None
+
+
+def coste_uniforme_compilado(problema):
+    """Búsqueda de coste uniforme sobre el grafo compilado del problema."""
+    contexto = problema.contexto
+    if contexto:
+        contexto.fase('compilacion')
+    grafo = problema.compilar()
+    origen = grafo.indice(problema.estado_inicial)
+    objetivos = [grafo.indice(objetivo)
+                 for objetivo in problema.estados_objetivos]
+    if contexto:
+        contexto.fase('busqueda')
+    alcanzados, padres, aristas, interrumpido = grafo.buscar(
+        origen, objetivos, contexto=contexto)
+    if interrumpido != -1:
+        contexto.parcial = grafo.reconstruir(problema, interrumpido, padres,
+                                             aristas)
+        return None
+    if not alcanzados:
+        return None
+    objetivo, _ = alcanzados.popitem()
+    return grafo.reconstruir(problema, objetivo, padres, aristas)
+
+
+def coste_uniforme_todos(problema):
+    """Búsqueda de coste uniforme hasta todos los objetivos de una vez.
+
+    Sigue expandiendo tras alcanzar cada objetivo hasta haberlos alcanzado
+    todos (o agotar la frontera). Devuelve un diccionario con el nodo del
+    camino de menor coste a cada objetivo alcanzable (sólo los alcanzados
+    si se agota el contexto).
+    """
+    raiz = crea_nodo_raiz(problema)
+    frontera = FronteraPrioridad(lambda nodo: nodo.coste)
+    frontera.agregar(raiz)
+    explorados = set()
+    pendientes = set(problema.estados_objetivos)
+    soluciones = {}
+    contexto = problema.contexto
+    while frontera and pendientes:
+        nodo = frontera.sacar()
+        if nodo.estado in pendientes:
+            soluciones[nodo.estado] = nodo
+            pendientes.discard(nodo.estado)
+        if contexto and contexto.agotado(nodo, len(frontera), len(explorados)):
+            break
+        explorados.add(nodo.estado)
+        for nombre_accion in problema.acciones_estado(nodo.estado):
+            accion = Accion(nombre_accion)
+            hijo = crea_nodo_hijo(problema, nodo, accion)
+            if hijo.estado not in explorados:
+                frontera.mejorar(hijo)
+    return soluciones
 
 
 # %%
@@ -77,62 +179,143 @@ def profundidad(problema):
     raiz = crea_nodo_raiz(problema)
     if problema.es_objetivo(raiz.estado):
         return raiz
-    frontera = [raiz, ]
+    frontera = FronteraPila()
+    frontera.agregar(raiz)
     explorados = set()
+    contexto = problema.contexto
     while True:
         if not frontera:
             return None
-        nodo = frontera.pop()
+        nodo = frontera.sacar()
+        if contexto and contexto.agotado(nodo, len(frontera), len(explorados)):
+            return None
         explorados.add(nodo.estado)
-        if not nodo.acciones:
-            continue
-        for nombre_accion in nodo.acciones.keys():
+        for nombre_accion in problema.acciones_estado(nodo.estado):
             accion = Accion(nombre_accion)
             hijo = crea_nodo_hijo(problema, nodo, accion)
-            estados_frontera = [nodo.estado for nodo in frontera]
             if(hijo.estado not in explorados and
-               hijo.estado not in estados_frontera):
+               hijo.estado not in frontera):
                 es_objetivo = problema.es_objetivo(hijo.estado)
                 if es_objetivo:
                     return hijo
-                frontera.append(hijo)
+                frontera.agregar(hijo)
 
 
 def profundidad_recursiva(problema, limite=99999):
-    """Versión recursiva de la búsqueda en grafos primero en profundidad."""
-    raiz = crea_nodo_raiz(problema)
-    explorados = set()
-    return __bpp_recursiva(raiz, problema, limite, explorados)
-
+    """Búsqueda en profundidad limitada que sólo evita ciclos del camino.
 
-def __bpp_recursiva(nodo, problema, limite, explorados):
-    """Función recursiva para realizar la búsqueda primero en profundidad."""
-    if problema.es_objetivo(nodo.estado):
-        return nodo
-    if limite == 0:
-        return None
-    explorados.add(nodo.estado)
-    if not nodo.acciones:
-        return None
-    for nombre_accion in nodo.acciones.keys():
-        accion = Accion(nombre_accion)
-        hijo = crea_nodo_hijo(problema, nodo, accion)
-        if hijo.estado not in explorados:
-            resultado = __bpp_recursiva(hijo, problema, limite - 1,
-                                        explorados.copy())
-            if resultado:
-                return resultado
-    return None
+    Aunque conserva el nombre, ya no es recursiva: usa una pila explícita,
+    por lo que no depende del límite de recursión de Python.
+    """
+    raiz = crea_nodo_raiz(problema)
+    return next(__profundidad_pila(problema, raiz, limite), None)
+
+
+def __profundidad_pila(problema, raiz, limite, por_coste=False,
+                       transposiciones=None, iteracion=0, maximo=None,
+                       cota=None, resumen=None):
+    """Recorrido en profundidad con pila explícita que genera los objetivos.
+
+    Los estados del camino actual se añaden al apilar y se quitan al
+    desapilar, de forma que sólo se evitan los ciclos y cada arista cuesta
+    O(1). El límite es la profundidad máxima del camino o, con por_coste,
+    el coste que el camino debe quedar por debajo. Los nodos objetivos no
+    se expanden.
+    Si se indica una tabla de transposiciones ({estado: (profundidad,
+    iteracion)}, con como mucho maximo entradas) no se expanden los estados
+    ya alcanzados a menor profundidad, ni los ya expandidos en esta
+    iteración a la misma profundidad.
+    Con una cota de coste tampoco se siguen los caminos que cuestan más que
+    ella. Si se indica un diccionario resumen se guardan en él el menor
+    coste que ha superado la cota ('siguiente', None si ninguno) y los nodos
+    generados ('generados').
+    """
+    if resumen is not None:
+        resumen['siguiente'] = None
+        resumen['generados'] = 1
+    if por_coste and limite <= 0:
+        return
+    if problema.es_objetivo(raiz.estado):
+        yield raiz
+        return
+    if limite <= 0:
+        return
+    contexto = problema.contexto
+    if contexto and contexto.agotado(raiz):
+        return
+    pila = [(raiz, 0, iter(problema.acciones_estado(raiz.estado)))]
+    en_camino = {raiz.estado}
+    while pila:
+        nodo, profundidad, acciones = pila[-1]
+        nombre_accion = next(acciones, None)
+        if nombre_accion is None:
+            pila.pop()
+            en_camino.discard(nodo.estado)
+            continue
+        hijo = crea_nodo_hijo(problema, nodo, Accion(nombre_accion))
+        if resumen is not None:
+            resumen['generados'] += 1
+        if hijo.estado in en_camino:
+            continue
+        if cota is not None and hijo.coste > cota:
+            if resumen is not None and (resumen['siguiente'] is None or
+                                        hijo.coste < resumen['siguiente']):
+                resumen['siguiente'] = hijo.coste
+            continue
+        if por_coste:
+            restante = limite - hijo.coste
+            if restante <= 0:
+                continue
+        else:
+            restante = limite - profundidad - 1
+        if problema.es_objetivo(hijo.estado):
+            yield hijo
+            continue
+        if restante <= 0:
+            continue
+        if transposiciones is not None:
+            anterior = transposiciones.get(hijo.estado)
+            if anterior is not None:
+                if(anterior[0] < profundidad + 1 or
+                   anterior == (profundidad + 1, iteracion)):
+                    continue
+                transposiciones[hijo.estado] = (profundidad + 1, iteracion)
+            elif maximo is None or len(transposiciones) < maximo:
+                transposiciones[hijo.estado] = (profundidad + 1, iteracion)
+        if contexto and contexto.agotado(hijo, len(pila)):
+            return
+        pila.append((hijo, profundidad + 1,
+                     iter(problema.acciones_estado(hijo.estado))))
+        en_camino.add(hijo.estado)
 
 
 # %%
-def profundidad_iterativa(problema, limite):
-    """Versión iterativa de la búsqueda en profundidad."""
+def profundidad_iterativa(problema, limite, transposiciones=None):
+    """Versión iterativa de la búsqueda en profundidad.
+
+    Con transposiciones (número máximo de entradas de la tabla) se guarda
+    la menor profundidad a la que se ha llegado a cada estado y se conserva
+    entre iteraciones, para no volver a expandir los estados alcanzados por
+    caminos más largos. Cuando la tabla se llena los estados nuevos se
+    exploran sin guardarlos.
+    """
     if limite is None:
         return profundidad_recursiva(problema)
+    contexto = problema.contexto
+    if transposiciones is None:
+        for i in range(1, limite + 1):
+            resultado = profundidad_recursiva(problema, i)
+            if resultado or (contexto and contexto.motivo):
+                return resultado
+        return None
+    tabla = {problema.estado_inicial: (0, 0)}
     for i in range(1, limite + 1):
-        resultado = profundidad_recursiva(problema, i)
-        if resultado:
+        raiz = crea_nodo_raiz(problema)
+        resultado = next(__profundidad_pila(problema, raiz, i,
+                                            transposiciones=tabla,
+                                            iteracion=i,
+                                            maximo=transposiciones), None)
+        if resultado or (contexto and contexto.motivo):
             return resultado
     return None
 
@@ -140,35 +323,40 @@ def profundidad_iterativa(problema, limite):
 # %%
 def profundidad_iterativa_coste(problema, limite=99999, paso=1):
     """Búsqueda en profundidad iterativa pero con costes."""
+    contexto = problema.contexto
     for i in range(1, limite + 1, paso):
         raiz = crea_nodo_raiz(problema)
-        explorados = set()
-        soluciones = []
-        __coste_recursivo(raiz, problema, i, explorados, soluciones)
+        soluciones = list(__profundidad_pila(problema, raiz, i, True))
         if soluciones:
             mejor = min(soluciones, key=lambda nodo: nodo.coste)
             return mejor
+        if contexto and contexto.motivo:
+            return None
     return None
 
 
-def __coste_recursivo(nodo, problema, limite, explorados, soluciones):
-    """Función recursiva de la busqueda en profundidad iterativa con costes."""
-    if limite <= 0:
-        return None
-    if problema.es_objetivo(nodo.estado):
-        soluciones.append(nodo)
-        return nodo
-    explorados.add(nodo.estado)
-    if not nodo.acciones:
-        return None
-    for nombre_accion in nodo.acciones.keys():
-        accion = Accion(nombre_accion)
-        hijo = crea_nodo_hijo(problema, nodo, accion)
-        if hijo.estado not in explorados:
-            coste = problema.coste_accion(nodo.estado, accion)
-            __coste_recursivo(hijo, problema, limite - coste,
-                                          explorados.copy(), soluciones)
-    return None
+def alargamiento_iterativo(problema, recuentos=None):
+    """Búsqueda de alargamiento iterativo (iterative lengthening).
+
+    Es una búsqueda en profundidad limitada por el coste del camino en la
+    que cada nuevo límite es el menor coste que superó el anterior (como
+    IDA* con heurística 0). Se detiene en el primer objetivo dentro del
+    límite, que por tanto es de coste mínimo. Si se indica una lista de
+    recuentos se añade (límite, nodos generados) por cada iteración.
+    """
+    limite = 0
+    resumen = {}
+    while True:
+        raiz = crea_nodo_raiz(problema)
+        nodo = next(__profundidad_pila(problema, raiz, float('inf'),
+                                       cota=limite, resumen=resumen), None)
+        if recuentos is not None:
+            recuentos.append((limite, resumen['generados']))
+        if nodo or resumen['siguiente'] is None:
+            return nodo
+        if problema.contexto and problema.contexto.motivo:
+            return None
+        limite = resumen['siguiente']
 
 
 # %%
@@ -184,11 +372,14 @@ def bidireccional(problema):
     frontera_f = [raiz_f, ]
     explorados_i = []
     explorados_f = []
+    contexto = problema.contexto
     while True:
         if not frontera_i or not frontera_f:
             return (None, None)
         nodo_i = frontera_i.pop(0)
         nodo_f = frontera_f.pop(0)
+        if contexto and contexto.agotado(nodo_i):
+            return (None, None)
         explorados_i.append(nodo_i)
         explorados_f.append(nodo_f)
         resultado_i = amplia_frontera(problema, nodo_i,
@@ -221,8 +412,73 @@ def bidireccional(problema):
             return (comun_i, comun_f)
 
 
+def bidireccional_coste(problema):
+    """Búsqueda bidireccional de coste uniforme (Dijkstra bidireccional).
+
+    Avanza a la vez desde el estado inicial con las acciones y desde los
+    estados objetivos con las acciones inversas, expandiendo siempre el lado
+    cuya frontera tiene menor coste. Termina cuando la suma de los menores
+    costes de las dos fronteras no mejora el mejor camino encontrado, que
+    entonces es el óptimo. Devuelve los dos nodos del estado de encuentro.
+    """
+    raiz_i = crea_nodo_raiz(problema)
+    if problema.es_objetivo(raiz_i.estado):
+        return (raiz_i, crea_nodo_raiz(problema, raiz_i.estado))
+    frontera_i = FronteraPrioridad(lambda nodo: nodo.coste)
+    frontera_f = FronteraPrioridad(lambda nodo: nodo.coste)
+    frontera_i.agregar(raiz_i)
+    alcanzados_i = {raiz_i.estado: raiz_i}
+    alcanzados_f = {}
+    for objetivo in problema.estados_objetivos:
+        raiz_f = crea_nodo_raiz(problema, objetivo)
+        frontera_f.agregar(raiz_f)
+        alcanzados_f[objetivo] = raiz_f
+    explorados_i = set()
+    explorados_f = set()
+    mejor = (None, None)
+    coste_mejor = float('inf')
+    contexto = problema.contexto
+    while frontera_i and frontera_f:
+        minimo_i = frontera_i.minimo()
+        minimo_f = frontera_f.minimo()
+        if minimo_i + minimo_f >= coste_mejor:
+            break
+        if contexto and contexto.agotado():
+            break
+        if minimo_i <= minimo_f:
+            nodo = frontera_i.sacar()
+            explorados_i.add(nodo.estado)
+            for nombre_accion in problema.acciones_estado(nodo.estado):
+                accion = Accion(nombre_accion)
+                hijo = crea_nodo_hijo(problema, nodo, accion)
+                if(hijo.estado in explorados_i or
+                   not frontera_i.mejorar(hijo)):
+                    continue
+                alcanzados_i[hijo.estado] = hijo
+                otro = alcanzados_f.get(hijo.estado)
+                if otro and hijo.coste + otro.coste < coste_mejor:
+                    coste_mejor = hijo.coste + otro.coste
+                    mejor = (hijo, otro)
+        else:
+            nodo = frontera_f.sacar()
+            explorados_f.add(nodo.estado)
+            for nombre_accion, origen in problema.predecesores_estado(
+                    nodo.estado):
+                accion = Accion(nombre_accion)
+                hijo = crea_nodo_inverso(problema, nodo, origen, accion)
+                if(hijo.estado in explorados_f or
+                   not frontera_f.mejorar(hijo)):
+                    continue
+                alcanzados_f[hijo.estado] = hijo
+                otro = alcanzados_i.get(hijo.estado)
+                if otro and hijo.coste + otro.coste < coste_mejor:
+                    coste_mejor = hijo.coste + otro.coste
+                    mejor = (otro, hijo)
+    return mejor
+
+
 def amplia_frontera(problema, nodo, objetivo, frontera, explorados):
-    for nombre_accion in nodo.acciones.keys():
+    for nombre_accion in problema.acciones_estado(nodo.estado):
         accion = Accion(nombre_accion)
         hijo = crea_nodo_hijo(problema, nodo, accion)
         estados_frontera = [nodo.estado for nodo in frontera]
@@ -239,9 +495,9 @@ def amplia_frontera(problema, nodo, objetivo, frontera, explorados):
 def crea_nodo_raiz(problema, estado=None):
     """Crea y devuelve el nodo raíz del problema indicado."""
     estado_raiz = estado or problema.estado_inicial
-    acciones_raiz = {}
-    if estado_raiz.nombre in problema.acciones.keys():
-        acciones_raiz = problema.acciones[estado_raiz.nombre]
+    if problema.nodos_ligeros:
+        return NodoLigero(estado_raiz)
+    acciones_raiz = problema.acciones_estado(estado_raiz)
     raiz = Nodo(estado_raiz, acciones=acciones_raiz)
     raiz.coste = 0
     return raiz
@@ -250,12 +506,32 @@ def crea_nodo_raiz(problema, estado=None):
 def crea_nodo_hijo(problema, padre, accion):
     """Crea y devuelve el nodo hijo."""
     nuevo_estado = problema.resultado(padre.estado, accion)
-    acciones_nuevo = {}
-    if nuevo_estado.nombre in problema.acciones.keys():
-        acciones_nuevo = problema.acciones[nuevo_estado.nombre]
-    hijo = Nodo(nuevo_estado, accion, acciones_nuevo, padre)
+    if problema.contexto:
+        problema.contexto.generar(nuevo_estado)
     coste = padre.coste
     coste += problema.coste_accion(padre.estado, accion)
+    if problema.nodos_ligeros:
+        return NodoLigero(nuevo_estado, padre, accion, coste)
+    acciones_nuevo = problema.acciones_estado(nuevo_estado)
+    hijo = Nodo(nuevo_estado, accion, acciones_nuevo, padre)
+    hijo.coste = coste
+    padre.hijos.append(hijo)
+    return hijo
+
+
+def crea_nodo_inverso(problema, padre, origen, accion):
+    """Crea el nodo del estado origen desde el que la acción lleva al padre.
+
+    Se usa en las búsquedas hacia atrás: el padre del nodo es el estado al
+    que se llega, más cerca del objetivo.
+    """
+    if problema.contexto:
+        problema.contexto.generar(origen)
+    coste = padre.coste
+    coste += problema.coste_accion(origen, accion)
+    if problema.nodos_ligeros:
+        return NodoLigero(origen, padre, accion, coste)
+    hijo = Nodo(origen, accion, problema.acciones_estado(origen), padre)
     hijo.coste = coste
     padre.hijos.append(hijo)
     return hijo
@@ -451,8 +727,14 @@ if __name__ == '__main__':
     LANZA_PROFUNDIDAD_RECURSIVA = True
     LANZA_PROFUNDIDAD_LIMITADA = True
     LANZA_PROFUNDIDAD_ITERATIVA = True
+    LANZA_PROFUNDIDAD_ITERATIVA_TABLA = True
     LANZA_PROFUNDIDAD_ITERATIVA_COSTES = True
+    LANZA_ALARGAMIENTO_ITERATIVO = True
     LANZA_BIDIRECCIONAL = True
+    LANZA_BIDIRECCIONAL_COSTE = True
+    LANZA_COSTE_UNIFORME_TODOS = True
+    LANZA_COMPILADOS = True
+    LANZA_IMPLICITO = True
 
     problema_resolver = problema_1
 
@@ -466,6 +748,20 @@ if __name__ == '__main__':
         solucion = coste_uniforme(problema_resolver)
         muestra_solucion(solucion,)
 
+    if LANZA_COSTE_UNIFORME_TODOS:
+        print("***** COSTE UNIFORME (TODOS LOS OBJETIVOS) *****")
+        soluciones = coste_uniforme_todos(problema_3)
+        for objetivo in problema_3.estados_objetivos:
+            muestra_solucion(soluciones.get(objetivo))
+
+    if LANZA_COMPILADOS:
+        print("***** PRIMERO EN ANCHURA (GRAFO COMPILADO) *****")
+        solucion = anchura_compilada(problema_resolver)
+        muestra_solucion(solucion)
+        print("***** COSTE UNIFORME (GRAFO COMPILADO) *****")
+        solucion = coste_uniforme_compilado(problema_resolver)
+        muestra_solucion(solucion)
+
     if LANZA_PROFUNDIDAD:
         print("***** PRIMERO EN PROFUNDIDAD *****")
         solucion = profundidad(problema_resolver)
@@ -488,6 +784,14 @@ if __name__ == '__main__':
         solucion = profundidad_iterativa(problema_resolver, LIMITE)
         muestra_solucion(solucion)
 
+    if LANZA_PROFUNDIDAD_ITERATIVA_TABLA:
+        print("***** PRIMERO EN PROFUNDIDAD (ITERATIVA CON TABLA) *****")
+        LIMITE = 10
+        TRANSPOSICIONES = 1000
+        solucion = profundidad_iterativa(problema_resolver, LIMITE,
+                                         TRANSPOSICIONES)
+        muestra_solucion(solucion)
+
     if LANZA_PROFUNDIDAD_ITERATIVA_COSTES:
         print("***** PRIMERO EN PROFUNDIDAD (ITERATIVA) CON COSTES *****")
         LIMITE = 1000
@@ -495,8 +799,48 @@ if __name__ == '__main__':
         solucion = profundidad_iterativa_coste(problema_resolver, LIMITE, PASO)
         muestra_solucion(solucion)
 
+    if LANZA_ALARGAMIENTO_ITERATIVO:
+        print("***** ALARGAMIENTO ITERATIVO *****")
+        recuentos = []
+        solucion = alargamiento_iterativo(problema_resolver, recuentos)
+        muestra_solucion(solucion)
+        msg = "Iteraciones: {0}, nodos generados: {1} (última {2})"
+        print(msg.format(len(recuentos),
+                         sum(generados for _, generados in recuentos),
+                         recuentos[-1][1]))
+
     if LANZA_BIDIRECCIONAL:
         print("***** BIDIRECCIONAL *****")
         solucion = bidireccional(problema_resolver)
         muestra_solucion(es_bidireccional=True,
                          nodos_bidireccional=solucion)
+
+    if LANZA_BIDIRECCIONAL_COSTE:
+        print("***** BIDIRECCIONAL (COSTE UNIFORME) *****")
+        solucion = bidireccional_coste(problema_resolver)
+        muestra_solucion(es_bidireccional=True,
+                         nodos_bidireccional=solucion)
+
+    if LANZA_IMPLICITO:
+        print("***** PROBLEMA IMPLÍCITO (JARRAS DE 4 Y 3 LITROS) *****")
+
+        def jarras(estado):
+            """Sucesores de un estado 'a-b' con a y b litros en las jarras."""
+            a, b = [int(litros) for litros in estado.nombre.split('-')]
+            a_en_b = min(a, 3 - b)
+            b_en_a = min(b, 4 - a)
+            destinos = {'llenar 4': (4, b),
+                        'llenar 3': (a, 3),
+                        'vaciar 4': (0, b),
+                        'vaciar 3': (a, 0),
+                        'verter 4 en 3': (a - a_en_b, b + a_en_b),
+                        'verter 3 en 4': (a + b_en_a, b - b_en_a)}
+            return {accion: Estado("{0}-{1}".format(*litros), [])
+                    for accion, litros in destinos.items()
+                    if litros != (a, b)}
+
+        problema_resolver = ProblemaImplicito(
+            Estado('0-0', []), jarras,
+            objetivo=lambda estado: estado.nombre.startswith('2-'))
+        solucion = anchura(problema_resolver)
+        muestra_solucion(solucion)
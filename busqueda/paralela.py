@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Búsqueda IDA* en paralelo repartiendo los subárboles entre procesos.
+
+Curso del canal de Youtube 'Descubriendo la Inteligencia Artificial'.
+Autor: JL Iglesias Feria (jl.iglesias.feria@gmail.com)
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Barrier
+from multiprocessing import Event
+from multiprocessing import Value
+from threading import BrokenBarrierError
+
+from grafos import Accion
+from grafos import Estado
+from informada import crea_nodo_hijo
+from informada import crea_nodo_raiz
+
+INFINITO = float('inf')
+
+# Problema, subárboles y datos compartidos de cada proceso trabajador.
+_problema = None
+_raices = None
+_parada = None
+_barrera = None
+_siguiente = None
+_minimo = None
+_limite = None
+
+
+# %%
+def ida_estrella_paralela(problema, workers=None, subarboles=None):
+    """Búsqueda IDA* repartiendo los subárboles de la raíz entre procesos.
+
+    El árbol se divide en la primera profundidad que da al menos el número
+    de subárboles indicado (por defecto cuatro por proceso). Cada proceso
+    recibe el problema y los subárboles una sola vez y hace todas las
+    iteraciones: con el límite actual va tomando el siguiente subárbol
+    libre y lo recorre en profundidad. Al acabar la iteración todos esperan
+    en una barrera, que fija como siguiente límite el menor valor que lo ha
+    superado en cualquiera de ellos. En cuanto un proceso encuentra una
+    solución avisa al resto para que paren. Los ciclos se detectan con los
+    estados del camino actual, por lo que con una heurística admisible la
+    solución es óptima. El problema debe poder enviarse a otros procesos.
+    """
+    workers = workers or os.cpu_count() or 1
+    raices = _divide(problema, subarboles or 4 * workers)
+    limite = problema.heuristica(problema.estado_inicial)
+    if workers <= 1:
+        acciones = None
+        while raices and acciones is None and limite != INFINITO:
+            minimo = INFINITO
+            for estados, acciones_raiz, coste in raices:
+                acciones, valor = profundidad_acotada(
+                    problema, estados, acciones_raiz, coste, limite)
+                if acciones is not None:
+                    break
+                minimo = min(minimo, valor)
+            limite = minimo
+    else:
+        parada = Event()
+        barrera = Barrier(workers, action=_siguiente_limite)
+        compartidos = (Value('l', 0), Value('d', INFINITO),
+                       Value('d', limite))
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_inicia_trabajador,
+                                 initargs=(problema, raices, parada, barrera,
+                                           *compartidos)) as ejecutor:
+            futuros = [ejecutor.submit(_trabaja) for _ in range(workers)]
+            soluciones = [futuro.result() for futuro in futuros]
+        acciones = next((solucion for solucion in soluciones
+                         if solucion is not None), None)
+    if acciones is None:
+        return None
+    nodo = crea_nodo_raiz(problema)
+    for nombre_accion in acciones:
+        nodo = crea_nodo_hijo(problema, nodo, Accion(nombre_accion))
+    return nodo
+
+
+def profundidad_acotada(problema, estados, acciones, coste, limite,
+                        parada=None):
+    """Búsqueda en profundidad desde un camino sin superar el límite de f.
+
+    Recibe los estados y acciones del camino desde la raíz y su coste. Usa
+    una pila explícita y no repite estados del camino actual. Devuelve las
+    acciones de la solución (o None) y el menor valor f que ha superado el
+    límite. Si se indica un aviso de parada y se activa, deja de buscar.
+    """
+    estado = estados[-1]
+    valor = coste + problema.heuristica(estado)
+    if valor > limite:
+        return None, valor
+    if problema.es_objetivo(estado):
+        return list(acciones), limite
+    estados = list(estados)
+    acciones = list(acciones)
+    costes = [coste]
+    en_camino = set(estados)
+    pila = [iter(problema.acciones_estado(estado).items())]
+    minimo = INFINITO
+    expandidos = 0
+    while pila:
+        siguiente = next(pila[-1], None)
+        if siguiente is None:
+            pila.pop()
+            if pila:
+                en_camino.discard(estados.pop())
+                acciones.pop()
+                costes.pop()
+            continue
+        nombre_accion, destino = siguiente
+        if destino in en_camino:
+            continue
+        nuevo_coste = costes[-1] + problema.coste_accion(estados[-1],
+                                                         Accion(nombre_accion))
+        valor = nuevo_coste + problema.heuristica(destino)
+        if valor > limite:
+            if valor < minimo:
+                minimo = valor
+            continue
+        if problema.es_objetivo(destino):
+            return acciones + [nombre_accion], limite
+        expandidos += 1
+        if parada is not None and expandidos % 1024 == 0 and parada.is_set():
+            return None, minimo
+        estados.append(destino)
+        acciones.append(nombre_accion)
+        costes.append(nuevo_coste)
+        en_camino.add(destino)
+        pila.append(iter(problema.acciones_estado(destino).items()))
+    return None, minimo
+
+
+def _divide(problema, total):
+    """Caminos desde la raíz hasta las raíces de los subárboles a repartir.
+
+    Cada camino es (estados, acciones, coste). Se expande en anchura hasta
+    tener al menos el total de subárboles indicado. Los estados objetivos
+    no se expanden y los que no tienen sucesores se descartan.
+    """
+    raices = [([problema.estado_inicial], [], 0)]
+    while len(raices) < total:
+        nuevas = []
+        expandida = False
+        for estados, acciones, coste in raices:
+            estado = estados[-1]
+            if problema.es_objetivo(estado):
+                nuevas.append((estados, acciones, coste))
+                continue
+            expandida = True
+            for nombre_accion, destino in problema.acciones_estado(
+                    estado).items():
+                if destino in estados:
+                    continue
+                nuevo_coste = coste + problema.coste_accion(
+                    estado, Accion(nombre_accion))
+                nuevas.append((estados + [destino], acciones + [nombre_accion],
+                               nuevo_coste))
+        raices = nuevas
+        if not expandida:
+            break
+    return raices
+
+
+def _inicia_trabajador(problema, raices, parada, barrera, siguiente,
+                       minimo, limite):
+    """Guarda el problema, los subárboles y los datos compartidos."""
+    global _problema, _raices, _parada, _barrera, _siguiente, _minimo
+    global _limite
+    _problema = problema
+    _raices = raices
+    _parada = parada
+    _barrera = barrera
+    _siguiente = siguiente
+    _minimo = minimo
+    _limite = limite
+
+
+def _trabaja():
+    """Hace en el proceso trabajador todas las iteraciones de IDA*.
+
+    Devuelve las acciones de la solución si la encuentra este proceso y
+    None en otro caso.
+    """
+    try:
+        while _limite.value != INFINITO:
+            limite = _limite.value
+            minimo = INFINITO
+            while not _parada.is_set():
+                with _siguiente.get_lock():
+                    indice = _siguiente.value
+                    _siguiente.value += 1
+                if indice >= len(_raices):
+                    break
+                estados, acciones, coste = _raices[indice]
+                acciones, valor = profundidad_acotada(
+                    _problema, estados, acciones, coste, limite, _parada)
+                if acciones is not None:
+                    _parada.set()
+                    _barrera.abort()
+                    return acciones
+                minimo = min(minimo, valor)
+            with _minimo.get_lock():
+                if minimo < _minimo.value:
+                    _minimo.value = minimo
+            _barrera.wait()
+    except BrokenBarrierError:
+        pass
+    return None
+
+
+def _siguiente_limite():
+    """Al acabar una iteración fija el siguiente límite y reinicia el reparto.
+
+    La ejecuta la barrera una sola vez, con todos los procesos esperando.
+    """
+    _limite.value = _minimo.value
+    _minimo.value = INFINITO
+    _siguiente.value = 0
+
+
+# %%
+LADO_PUZLE = 3
+MOVIMIENTOS_PUZLE = {'Arriba': -LADO_PUZLE, 'Abajo': LADO_PUZLE,
+                     'Izquierda': -1, 'Derecha': 1}
+
+
+def sucesores_puzle(estado):
+    """Estados a los que se llega moviendo el hueco del puzle de 8 fichas.
+
+    Está fuera del bloque principal para que los procesos trabajadores
+    puedan importarla aunque se creen con el método 'spawn'.
+    """
+    fichas = [int(ficha) for ficha in estado.nombre.split(',')]
+    hueco = fichas.index(0)
+    resultado = {}
+    for nombre, salto in MOVIMIENTOS_PUZLE.items():
+        destino = hueco + salto
+        if not 0 <= destino < LADO_PUZLE * LADO_PUZLE:
+            continue
+        if abs(salto) == 1 and destino // LADO_PUZLE != hueco // LADO_PUZLE:
+            continue
+        nuevas = list(fichas)
+        nuevas[hueco], nuevas[destino] = nuevas[destino], nuevas[hueco]
+        resultado[nombre] = Estado(','.join(map(str, nuevas)), [])
+    return resultado
+
+
+def manhattan_puzle(estado):
+    """Suma de las distancias Manhattan de cada ficha a su casilla final."""
+    total = 0
+    fichas = [int(ficha) for ficha in estado.nombre.split(',')]
+    for posicion, ficha in enumerate(fichas):
+        if ficha:
+            fila, columna = divmod(posicion, LADO_PUZLE)
+            fila_fin, columna_fin = divmod(ficha - 1, LADO_PUZLE)
+            total += abs(fila - fila_fin) + abs(columna - columna_fin)
+    return total
+
+
+# %%
+if __name__ == '__main__':
+    import time
+
+    from grafos import ProblemaImplicito
+    from informada import a_estrella
+
+    INICIAL = '8,6,7,2,5,4,3,0,1'
+    OBJETIVO = '1,2,3,4,5,6,7,8,0'
+
+    problema_puzle = ProblemaImplicito(Estado(INICIAL, []), sucesores_puzle,
+                                       [Estado(OBJETIVO, [])],
+                                       heuristica=manhattan_puzle)
+
+    print("***** A* *****")
+    inicio = time.perf_counter()
+    solucion = a_estrella(problema_puzle)
+    print("Coste {0} en {1:.2f} s".format(solucion.coste,
+                                          time.perf_counter() - inicio))
+    for workers in (1, 2, 4):
+        print("***** IDA* EN PARALELO ({0} PROCESOS) *****".format(workers))
+        inicio = time.perf_counter()
+        solucion = ida_estrella_paralela(problema_puzle, workers)
+        print("Coste {0} en {1:.2f} s".format(solucion.coste,
+                                              time.perf_counter() - inicio))
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Medidas de memoria de los nodos usados en las búsquedas en grafos.
+
+Curso del canal de Youtube 'Descubriendo la Inteligencia Artificial'.
+Autor: JL Iglesias Feria (jl.iglesias.feria@gmail.com)
+"""
+import tracemalloc
+
+from grafos import Accion
+from grafos import Estado
+from grafos import Nodo
+from grafos import NodoLigero
+from grafos import Problema
+from noinformada import coste_uniforme
+
+
+# %%
+def rejilla(lado, nodos_ligeros=False):
+    """Crea el problema de cruzar una rejilla de lado x lado casillas."""
+    estados = {}
+    for fila in range(lado):
+        for columna in range(lado):
+            nombre = "{0},{1}".format(fila, columna)
+            estados[(fila, columna)] = Estado(nombre, [])
+    movimientos = {'N': (-1, 0), 'S': (1, 0), 'E': (0, 1), 'O': (0, -1)}
+    acciones = {}
+    costes = {}
+    for (fila, columna), estado in estados.items():
+        acciones[estado.nombre] = {}
+        costes[estado.nombre] = {}
+        for nombre, (d_fila, d_columna) in movimientos.items():
+            vecino = (fila + d_fila, columna + d_columna)
+            if vecino in estados:
+                estado.acciones.append(Accion(nombre))
+                acciones[estado.nombre][nombre] = estados[vecino]
+                costes[estado.nombre][nombre] = 1 + (fila * columna) % 7
+    inicial = estados[(0, 0)]
+    objetivo = estados[(lado - 1, lado - 1)]
+    return Problema(inicial, [objetivo], acciones, costes,
+                    heuristicas={}, nodos_ligeros=nodos_ligeros)
+
+
+def cuenta_arbol(raiz):
+    """Cuenta los nodos que cuelgan de un nodo raíz (incluido él mismo)."""
+    total = 0
+    pendientes = [raiz]
+    while pendientes:
+        nodo = pendientes.pop()
+        total += 1
+        pendientes.extend(nodo.hijos)
+    return total
+
+
+def cuenta_expansiones(busqueda, problema):
+    """Resuelve el problema con la búsqueda contando los estados expandidos.
+
+    Cuenta las veces que se piden las acciones o los predecesores de un
+    estado, usando nodos ligeros para no contar las de los nodos hijos.
+    Devuelve la solución y el número de expansiones.
+    """
+    contador = [0]
+    acciones_estado = problema.acciones_estado
+    predecesores_estado = problema.predecesores_estado
+
+    def acciones_contadas(estado):
+        contador[0] += 1
+        return acciones_estado(estado)
+
+    def predecesores_contados(estado):
+        contador[0] += 1
+        return predecesores_estado(estado)
+
+    nodos_ligeros = problema.nodos_ligeros
+    problema.nodos_ligeros = True
+    problema.acciones_estado = acciones_contadas
+    problema.predecesores_estado = predecesores_contados
+    try:
+        solucion = busqueda(problema)
+    finally:
+        del problema.acciones_estado
+        del problema.predecesores_estado
+        problema.nodos_ligeros = nodos_ligeros
+    return solucion, contador[0]
+
+
+def bytes_por_nodo(clase, total=100000):
+    """Mide los bytes que ocupa cada nodo de la clase indicada."""
+    estado = Estado('E', [])
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    nodos = [clase(estado) for _ in range(total)]
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del nodos
+    return (despues - antes) / total
+
+
+def memoria_busqueda(lado, nodos_ligeros):
+    """Mide la memoria que retiene una búsqueda de coste uniforme.
+
+    Devuelve la solución, la memoria retenida mientras se conserva la
+    solución (y con ella el nodo raíz) y el pico de memoria de la búsqueda.
+    """
+    problema = rejilla(lado, nodos_ligeros)
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    solucion = coste_uniforme(problema)
+    retenida, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return solucion, retenida - antes, pico - antes
+
+
+def generados(lado):
+    """Número de nodos generados por coste uniforme en la rejilla."""
+    problema = rejilla(lado)
+    solucion = coste_uniforme(problema)
+    raiz = solucion
+    while raiz.padre:
+        raiz = raiz.padre
+    return cuenta_arbol(raiz)
+
+
+# %%
+if __name__ == '__main__':
+    LADO = 60
+
+    print("***** BYTES POR NODO *****")
+    for clase in (Nodo, NodoLigero):
+        msg = "{0}: {1:.0f} bytes"
+        print(msg.format(clase.__name__, bytes_por_nodo(clase)))
+
+    print("***** COSTE UNIFORME EN REJILLA {0}x{0} *****".format(LADO))
+    total = generados(LADO)
+    print("Nodos generados: {0}".format(total))
+    for ligeros in (False, True):
+        solucion, retenida, pico = memoria_busqueda(LADO, ligeros)
+        msg = "{0}: coste {1}, {2:.0f} bytes/nodo retenidos, {3:.0f} pico"
+        print(msg.format('NodoLigero' if ligeros else 'Nodo',
+                         solucion.coste, retenida / total, pico / total))